@@ -0,0 +1,107 @@
+"""Benchmark the import time of PackageDev modules.
+
+Each module is imported in a fresh interpreter using the stand-in modules of `harness`,
+so plugin host startup regressions show up as changes of these numbers.
+The stand-in modules and parent packages are imported before the timer starts.
+Some benchmarks additionally measure the first use of data that is built lazily.
+
+Usage: python benchmarks/bench_import.py [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+
+import harness
+
+# (name, module relative to `PackageDev.plugins`, statement timed after the import)
+BENCHMARKS = [
+    ("import lib.scope_data", "lib.scope_data", None),
+    ("first scope completion", "lib.scope_data", "module.completions_from_prefix('meta.')"),
+    ("import settings", "settings", None),
+]
+
+_SCRIPT = """\
+import importlib, sys, time
+sys.path.insert(0, {bench_dir!r})
+import harness
+harness.import_package()
+name = harness.PACKAGE_NAME + ".plugins." + {module!r}
+importlib.import_module(name.rpartition(".")[0])
+start = time.perf_counter()
+module = importlib.import_module(name)
+if {statement!r}:
+    start = time.perf_counter()
+    exec({statement!r})
+print(time.perf_counter() - start)
+"""
+
+
+def run_once(module, statement):
+    """Return the duration of the import or the statement in a fresh interpreter, in seconds."""
+    script = _SCRIPT.format(bench_dir=harness.BENCH_DIR, module=module, statement=statement)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=harness.ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=harness.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    # compile byte code once, so it is not part of the first measurement
+    for _, module, statement in BENCHMARKS:
+        run_once(module, statement)
+
+    results = []
+    for name, module, statement in BENCHMARKS:
+        durations = [run_once(module, statement) for _ in range(args.repeat)]
+        results.append(
+            {
+                'benchmark': name,
+                'repeat': args.repeat,
+                'best_ms': min(durations) * 1000,
+                'median_ms': statistics.median(durations) * 1000,
+            }
+        )
+
+    print(f"{'benchmark':<26} {'best ms':>10} {'median ms':>10}")
+    for result in results:
+        print(f"{result['benchmark']:<26} {result['best_ms']:>10.3f} {result['median_ms']:>10.3f}")
+
+    if args.output:
+        data = {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Benchmark the scope naming convention tree.
+
+Measures building the tree from its data, the memory it keeps alive,
+and resolving scope completions for the dotted path of every node.
+
+Usage: python benchmarks/bench_scope_data.py [--repeat N]
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+import harness
+
+
+def measure(func, repeat):
+    """Return the durations of `repeat` calls of `func` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _path(node):
+    names = []
+    while node:
+        names.append(node.name)
+        node = node.parent
+    return ".".join(reversed(names))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    scope_data = harness.import_module("lib.scope_data")
+    nodes, _ = scope_data._build_tree()
+    prefixes = [_path(node) + "." for node in nodes]
+
+    gc.collect()
+    tracemalloc.start()
+    tree = scope_data._build_tree()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+
+    # build the completion lists once, as the first completion would
+    for prefix in prefixes:
+        scope_data.completions_from_prefix(prefix)
+
+    def complete_all():
+        for prefix in prefixes:
+            scope_data.completions_from_prefix(prefix)
+
+    def tree_all():
+        for node in nodes:
+            node.tree()
+
+    benchmarks = [
+        ("build tree", scope_data._build_tree),
+        (f"complete {len(prefixes)} prefixes", complete_all),
+        (f"tree() of {len(nodes)} nodes", tree_all),
+    ]
+
+    print(f"tree: {len(nodes)} nodes, {size / 1024:.1f} KiB")
+    print(f"{'benchmark':<26} {'best ms':>10} {'median ms':>10}")
+    for name, func in benchmarks:
+        durations = measure(func, args.repeat)
+        print(
+            f"{name:<26} {min(durations) * 1000:>10.3f}"
+            f" {statistics.median(durations) * 1000:>10.3f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Benchmark the settings plugins on generated settings files.
+
+Runs outside of Sublime Text using the stand-in modules of `harness`.
+Each benchmark is run for settings files with 100, 1k and 10k keys by default.
+Results are printed as a table and can be written as JSON
+to compare them between commits.
+
+Usage: python benchmarks/bench_settings.py [--keys N ...] [--repeat N] [--output FILE]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+
+import harness
+import sublime
+import sublime_plugin
+
+BASE_NAME = "Bench.sublime-settings"
+BASE_RESOURCE = f"Packages/Bench/{BASE_NAME}"
+# share of keys in the user file that are unknown
+UNKNOWN_EVERY = 10
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=harness.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat, setup=None):
+    """Return the durations of `repeat` calls of `func` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+class Fixture:
+    """Resources, index and views for one settings file size."""
+
+    def __init__(self, num_keys):
+        self.num_keys = num_keys
+        self.settings = harness.import_module("settings")
+        self.known_settings_module = harness.import_module("settings.known_settings")
+        self.index_cache = harness.import_module("settings.index_cache")
+
+        harness.close_all_views()
+        harness.clear_resources()
+        harness.add_resource(BASE_RESOURCE, harness.generate_settings(num_keys))
+
+        # a user file with the same keys, some of them unknown
+        user_text = harness.generate_settings(num_keys, key_format="setting_{}")
+        for i in range(0, num_keys, UNKNOWN_EVERY):
+            user_text = user_text.replace(f'"setting_{i}":', f'"unknown_{i}":', 1)
+        self.user_text = user_text
+        self.view = harness.open_view(user_text, harness.user_file_path(BASE_NAME))
+
+        self.index_cache.clear_index_cache()
+        self.listener = self.settings.SettingsListener(self.view)
+        sublime.run_timeouts()
+        self.known_settings = self.listener.known_settings
+
+        key_regions = self.view.find_by_selector(self.settings.KEY_SCOPE)
+        value_regions = self.view.find_by_selector(self.settings.VALUE_SCOPE)
+        # a known key in the middle of the file with values enumerated in its comment
+        middle = len(key_regions) // 2
+        middle += 1 if middle % UNKNOWN_EVERY == 0 else 0
+        self.key_point = key_regions[middle].begin() + 1
+        self.value_point = value_regions[middle].begin()
+        # the position after the last member
+        self.new_key_point = value_regions[-1].end()
+
+    def load_index(self, cached):
+        """Create a new index for the base file and wait for it to load."""
+        if not cached:
+            self.index_cache.clear_index_cache()
+        known_settings = self.known_settings_module.KnownSettings(BASE_NAME)
+        sublime.run_timeouts()
+        assert len(known_settings.keys()) == self.num_keys
+
+    def invalidate(self):
+        """Drop all data derived from the index, as a reload would."""
+        self.known_settings._update_maps()
+
+    def key_completions(self):
+        return self.known_settings.key_completions(self.view, "", self.new_key_point)
+
+    def value_completions(self):
+        return self.known_settings.value_completions(self.view, "", self.value_point)
+
+    def hover(self):
+        self.listener.on_hover(self.key_point, sublime.HOVER_TEXT)
+        assert self.view.is_popup_visible()
+        self.view.hide_popup()
+
+    def lint_full(self):
+        self.listener.do_linting()
+
+    def lint_line(self):
+        line = self.view.line(self.key_point)
+        self.listener._lint_region(line)
+
+    def close(self):
+        sublime_plugin._unregister_view(self.view)
+        del self.listener, self.known_settings
+        gc.collect()
+        harness.close_all_views()
+
+
+def run_benchmarks(num_keys, repeat):
+    fixture = Fixture(num_keys)
+    benchmarks = [
+        ("index load (cold)", lambda: fixture.load_index(cached=False), None),
+        ("index load (cached)", lambda: fixture.load_index(cached=True), None),
+        ("key completion (first)", fixture.key_completions, fixture.invalidate),
+        ("key completion", fixture.key_completions, None),
+        ("value completion (first)", fixture.value_completions, fixture.invalidate),
+        ("value completion", fixture.value_completions, None),
+        ("hover (first)", fixture.hover, fixture.invalidate),
+        ("hover", fixture.hover, None),
+        ("lint (full)", fixture.lint_full, fixture.invalidate),
+        ("lint (line)", fixture.lint_line, None),
+    ]
+
+    # sanity checks
+    assert fixture.key_completions(), "no key completions"
+    assert fixture.value_completions(), "no value completions"
+    fixture.lint_full()
+    unknown = fixture.view.get_regions('unknown_settings_keys')
+    assert len(unknown) == -(-num_keys // UNKNOWN_EVERY), "unexpected lint results"
+
+    results = []
+    for name, func, setup in benchmarks:
+        durations = measure(func, repeat, setup)
+        results.append(
+            {
+                'benchmark': name,
+                'keys': num_keys,
+                'repeat': repeat,
+                'best_ms': min(durations) * 1000,
+                'median_ms': statistics.median(durations) * 1000,
+            }
+        )
+    fixture.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    for num_keys in args.keys:
+        results.extend(run_benchmarks(num_keys, args.repeat))
+
+    print(f"{'benchmark':<26} {'keys':>6} {'best ms':>10} {'median ms':>10}")
+    for result in results:
+        print(
+            f"{result['benchmark']:<26} {result['keys']:>6}"
+            f" {result['best_ms']:>10.3f} {result['median_ms']:>10.3f}"
+        )
+
+    if args.output:
+        data = {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
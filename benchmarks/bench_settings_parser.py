@@ -0,0 +1,175 @@
+"""Compare the settings tokenizer with the previous line-based parser.
+
+Runs outside of Sublime Text on synthetic `Preferences.sublime-settings` files.
+
+Usage: python benchmarks/bench_settings_parser.py [--keys N] [--repeat N]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import textwrap
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_tokenizer():
+    # imported by path because the `plugins` package requires the `sublime` module
+    path = os.path.join(ROOT, "plugins", "settings", "tokenizer.py")
+    spec = importlib.util.spec_from_file_location("tokenizer", path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_parse_settings(lines):
+    """The line-based parser previously used by `KnownSettings`.
+
+    `json.loads` stands in for `sublime.decode_value`.
+    """
+    content, comments = _legacy_parse(lines)
+    return json.loads('\n'.join(content)), comments
+
+
+def legacy_parse_comments(lines):
+    """Return only the comments extracted by the legacy parser."""
+    return _legacy_parse(lines)[1]
+
+
+def _legacy_parse(lines):
+    content = []
+    comment = []
+    comments = {}
+    in_comment = False
+
+    for line in lines:
+        stripped = line.strip()
+
+        if in_comment:
+            if stripped.endswith("*/"):
+                in_comment = False
+                line = line.rstrip("*/ \t")
+                if line:
+                    comment.append(line)
+            elif stripped.startswith("* "):
+                comment.append(stripped[2:])
+            else:
+                comment.append(line)
+            continue
+        elif not stripped:
+            continue
+
+        if stripped.startswith("/*"):
+            in_comment = True
+            stripped = stripped[2:].lstrip("*")
+            if stripped:
+                comment.append(stripped)
+            continue
+
+        if stripped.startswith("//"):
+            stripped = stripped[2:]
+            if not stripped or not stripped.endswith("//"):
+                comment.append(stripped)
+            continue
+
+        content.append(line)
+        if comment:
+            match = re.match(r'"((?:[^"]|\\.)*)":', stripped)
+            if not match:
+                continue
+            key = match.group(1)
+            if key not in comments:
+                comments[key] = textwrap.dedent('\n'.join(comment))
+            comment.clear()
+
+    return content, comments
+
+
+def generate_settings(num_keys):
+    """Generate a settings file with comments and values of various types."""
+    values = [
+        '12',
+        'true',
+        '"a string value"',
+        '["one", "two", "three"]',
+        '{\n\t\t"nested": [1, 2, 3],\n\t\t"flag": false\n\t}',
+        '0.75',
+    ]
+    members = []
+    for i in range(num_keys):
+        if i % 10 == 0:
+            doc = (
+                f"\t/*\n\t * Block comment for setting_{i}.\n"
+                "\t * Valid values: \"on\", \"off\".\n\t */\n"
+            )
+        else:
+            doc = f"\t// Comment for setting_{i}.\n\t// Valid values are `true` and `false`.\n"
+        members.append(f'{doc}\t"setting_{i}": {values[i % len(values)]}')
+    return "// Generated settings\n{\n" + ",\n\n".join(members) + "\n}\n"
+
+
+# snippets whose comments the legacy parser could not extract from generated files
+PARITY_CASES = [
+    # a trailing comment followed by the documentation of the next key
+    '{\n\t"a": 1, // trailing\n\t// doc for b\n\t// more\n\t"b": 2\n}\n',
+    # separators and empty comment lines
+    '{\n\t////////\n\t// doc\n\t//\n\t// for c //\n\t// end\n\t"c": 3\n}\n',
+]
+
+
+def measure(funcs, repeat):
+    """Return the best duration and the peak memory of each function.
+
+    Runs are interleaved, so load changes on the machine affect all functions alike.
+    """
+    best = [float('inf')] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            func()
+            best[i] = min(best[i], time.perf_counter() - start)
+
+    peaks = []
+    for func in funcs:
+        tracemalloc.start()
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return list(zip(best, peaks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    tokenizer = _load_tokenizer()
+    text = generate_settings(args.keys)
+
+    legacy_values, legacy_comments = legacy_parse_settings(text.splitlines())
+    raw_values, comments = tokenizer.parse_settings(text)
+    assert comments == legacy_comments, "comments differ"
+    assert {k: json.loads(v) for k, v in raw_values.items()} == legacy_values, "values differ"
+    for case in PARITY_CASES:
+        # the legacy parser can't decode trailing comments, so only compare comments
+        legacy_comments = legacy_parse_comments(case.splitlines())
+        assert tokenizer.parse_settings(case)[1] == legacy_comments, f"comments differ: {case!r}"
+
+    print(f"{args.keys} keys, {len(text) / 1024:.0f} KiB, best of {args.repeat}")
+    benchmarks = {
+        "legacy": lambda: legacy_parse_settings(text.splitlines()),
+        "tokenizer": lambda: tokenizer.parse_settings(text),
+    }
+    results = measure(list(benchmarks.values()), args.repeat)
+    for name, (duration, peak) in zip(benchmarks, results):
+        print(f"  {name:<10} {duration * 1000:8.2f} ms  {peak / 1024:8.0f} KiB peak")
+
+
+if __name__ == '__main__':
+    main()
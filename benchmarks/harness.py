@@ -0,0 +1,228 @@
+"""Run the settings plugins outside of Sublime Text on generated settings files.
+
+The stand-in modules in `stubs/` replace `sublime`, `sublime_plugin` and `sublime_lib`.
+Views are backed by tokens from `tokenize_settings`,
+which assigns the scopes of the `Sublime Text Settings` syntax
+to the subset of JSON produced by `generate_settings`.
+"""
+
+import importlib
+import os
+import re
+import sys
+import types
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+PACKAGE_NAME = "PackageDev"
+
+sys.path.insert(0, os.path.join(BENCH_DIR, "stubs"))
+
+import sublime  # noqa: E402
+
+BASE_SCOPE = "source.json.sublime.settings"
+MAPPING_SCOPE = f"{BASE_SCOPE} meta.settings-mapping.sublime-settings meta.mapping.json"
+KEY_SCOPE = f"{BASE_SCOPE} meta.mapping.key.json string.quoted.double.json"
+VALUE_SCOPE = (
+    f"{BASE_SCOPE} meta.settings-mapping.sublime-settings meta.setting-value.sublime-settings"
+)
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<line_comment>//[^\n]*)
+    | (?P<block_comment>/\*.*?\*/)
+    | (?P<begin>\{)
+    | (?P<end>\})
+    | (?P<key>"(?:[^"\\]|\\.)*")(?P<colon>\s*:)(?P<value_ws>\s*)
+    | (?P<comma>,)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_VALUE_RE = re.compile(
+    r"""
+    (?P<string>"(?:[^"\\]|\\.)*")
+    | (?P<number>-?\d+(?:\.\d+)?)
+    | (?P<constant>true|false|null)
+    """,
+    re.VERBOSE,
+)
+_VALUE_SCOPES = {
+    'string': "string.quoted.double.json",
+    'number': "constant.numeric.json",
+    'constant': "constant.language.json",
+    '[': "meta.sequence.json",
+    '{': "meta.mapping.json",
+}
+
+
+def import_package():
+    """Import `PackageDev.plugins` without running its `__init__` and return it.
+
+    Its `__init__` imports all plugins,
+    most of which need more of the API than the stand-in modules provide.
+    """
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [ROOT]
+        sys.modules[PACKAGE_NAME] = package
+        plugins = types.ModuleType(f"{PACKAGE_NAME}.plugins")
+        plugins.__path__ = [os.path.join(ROOT, "plugins")]
+        sys.modules[plugins.__name__] = plugins
+        _load_package_settings()
+    return sys.modules[f"{PACKAGE_NAME}.plugins"]
+
+
+def import_module(name):
+    """Import a module relative to `PackageDev.plugins`, e.g. `settings.known_settings`."""
+    import_package()
+    return importlib.import_module(f"{PACKAGE_NAME}.plugins.{name}")
+
+
+def _load_package_settings():
+    path = os.path.join(ROOT, "Package", "PackageDev.sublime-settings")
+    with open(path, encoding='utf-8') as f:
+        defaults = sublime.decode_value(f.read())
+    settings = sublime.load_settings("PackageDev.sublime-settings")
+    for key, value in defaults.items():
+        settings.set(key, value)
+
+
+def generate_settings(num_keys, key_format="setting_{}"):
+    """Generate a settings file with comments and values of various types.
+
+    Comments mention some allowed values
+    in the ways `KnownSettings` extracts them from.
+    """
+    values = [
+        '12',
+        'true',
+        '"a string value"',
+        '["one", "two", "three"]',
+        '{"nested": [1, 2, 3], "flag": false}',
+        '0.75',
+    ]
+    members = []
+    for i in range(num_keys):
+        key = key_format.format(i)
+        if i % 10 == 0:
+            doc = (
+                f"\t/*\n\t * Block comment for {key}.\n"
+                "\t * Valid values: \"on\", \"off\", \"auto\".\n\t */\n"
+            )
+        else:
+            doc = f"\t// Comment for {key}.\n\t// Valid values are `true` and `false`.\n"
+        members.append(f'{doc}\t"{key}": {values[i % len(values)]}')
+    return "// Generated settings\n{\n" + ",\n\n".join(members) + "\n}\n"
+
+
+def _skip_nested(text, pos):
+    """Return the end of the array or object starting at `pos`."""
+    depth = 0
+    for match in re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]').finditer(text, pos):
+        char = match.group()
+        if char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return len(text)
+
+
+def _add_value(text, pos, add):
+    """Add the token of the value starting at `pos` and return its end."""
+    if pos >= len(text):
+        return pos
+    if text[pos] in "[{":
+        end = _skip_nested(text, pos)
+        kind = text[pos]
+    else:
+        match = _VALUE_RE.match(text, pos)
+        if not match or not match.lastgroup:
+            return pos
+        end, kind = match.end(), match.lastgroup
+    add(pos, end, f"{VALUE_SCOPE} {_VALUE_SCOPES[kind]}")
+    return end
+
+
+def tokenize_settings(text):
+    """Return sorted `(Region, scope)` tokens of a settings file.
+
+    Only top-level keys and values are distinguished;
+    nested values form a single token.
+    """
+    tokens = []
+    Region = sublime.Region
+
+    def add(begin, end, scope):
+        if end > begin:
+            tokens.append((Region(begin, end), scope))
+
+    in_mapping = False
+    pos, size = 0, len(text)
+    while pos < size:
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            # unexpected content
+            add(pos, pos + 1, BASE_SCOPE)
+            pos += 1
+            continue
+
+        kind = match.lastgroup
+        scope = MAPPING_SCOPE if in_mapping else BASE_SCOPE
+        if kind == 'ws':
+            add(pos, match.end(), scope)
+        elif kind == 'line_comment':
+            add(pos, match.end(), f"{scope} comment.line.double-slash.js")
+        elif kind == 'block_comment':
+            add(pos, match.end(), f"{scope} comment.block.js")
+        elif kind == 'begin':
+            in_mapping = True
+            add(pos, match.end(), f"{MAPPING_SCOPE} punctuation.section.mapping.begin.json")
+        elif kind == 'end':
+            add(pos, match.end(), f"{MAPPING_SCOPE} punctuation.section.mapping.end.json")
+            in_mapping = False
+        elif kind == 'comma':
+            add(pos, match.end(), f"{MAPPING_SCOPE} punctuation.separator.mapping.pair.json")
+        else:
+            key_begin, key_end = match.span('key')
+            add(key_begin, key_begin + 1, f"{KEY_SCOPE} punctuation.definition.string.begin.json")
+            add(key_begin + 1, key_end - 1, f"{KEY_SCOPE} entity.name.other.key.sublime-settings")
+            add(key_end - 1, key_end, f"{KEY_SCOPE} punctuation.definition.string.end.json")
+            colon_begin, colon_end = match.span('colon')
+            add(colon_begin, colon_end, f"{MAPPING_SCOPE} punctuation.separator.key-value.json")
+            # whitespace up to the value
+            value_begin = match.end('value_ws')
+            add(colon_end, value_begin, f"{MAPPING_SCOPE} meta.expect-value.sublime-settings")
+            pos = _add_value(text, value_begin, add)
+            continue
+        pos = match.end()
+    return tokens
+
+
+def add_resource(path, content):
+    sublime.RESOURCES[path] = content
+
+
+def clear_resources():
+    sublime.RESOURCES.clear()
+
+
+def open_view(text, file_name=None, settings=None):
+    """Open a view of a settings file, making it the active view."""
+    return sublime.View.create(text, tokenize_settings(text), file_name, settings)
+
+
+def modify_view(view, text):
+    """Replace the text of a view, re-computing its scopes."""
+    view.set_content(text, tokenize_settings(text))
+
+
+def user_file_path(file_name):
+    return os.path.join(sublime.packages_path(), "User", file_name)
+
+
+def close_all_views():
+    for view in list(sublime.active_window().views):
+        view.close()
@@ -0,0 +1,520 @@
+"""A stand-in for the `sublime` module to run plugin code outside of Sublime Text.
+
+Only the parts of the API used by the settings plugins are provided.
+Resources are served from `RESOURCES`,
+timeouts are queued until `run_timeouts` is called
+and views are backed by a list of `(Region, scope)` tokens.
+"""
+
+import atexit
+import bisect
+import enum
+import fnmatch
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+
+# {resource path: content}
+RESOURCES = {}
+
+_TEMP_DIR = tempfile.mkdtemp(prefix="packagedev-bench-")
+atexit.register(shutil.rmtree, _TEMP_DIR, True)
+
+KIND_ID_AMBIGUOUS = 0
+KIND_ID_KEYWORD = 1
+KIND_ID_TYPE = 2
+KIND_ID_FUNCTION = 3
+KIND_ID_NAMESPACE = 4
+KIND_ID_NAVIGATION = 5
+KIND_ID_MARKUP = 6
+KIND_ID_VARIABLE = 7
+KIND_ID_SNIPPET = 8
+
+COMPLETION_FORMAT_TEXT = 0
+COMPLETION_FORMAT_SNIPPET = 1
+COMPLETION_FORMAT_COMMAND = 2
+INHIBIT_WORD_COMPLETIONS = 8
+
+HOVER_TEXT = 1
+HIDE_ON_MOUSE_MOVE_AWAY = 2
+COOPERATE_WITH_AUTO_COMPLETE = 2
+LAYOUT_INLINE = 0
+
+
+class RegionFlags(enum.IntFlag):
+    NONE = 0
+    DRAW_EMPTY = 1
+    HIDE_ON_MINIMAP = 2
+    DRAW_EMPTY_AS_OVERWRITE = 4
+    PERSISTENT = 16
+    DRAW_NO_FILL = 32
+    HIDDEN = 128
+    DRAW_NO_OUTLINE = 256
+    DRAW_SOLID_UNDERLINE = 512
+    DRAW_STIPPLED_UNDERLINE = 1024
+    DRAW_SQUIGGLY_UNDERLINE = 2048
+    NO_UNDO = 8192
+
+
+# timeouts queued by `set_timeout` and `set_timeout_async`
+_timeouts = []
+
+
+def set_timeout(callback, delay=0):
+    _timeouts.append((delay, len(_timeouts), callback))
+
+
+set_timeout_async = set_timeout
+
+
+def run_timeouts():
+    """Run all queued timeouts in order of their delay, including ones queued meanwhile."""
+    while _timeouts:
+        _timeouts.sort(key=lambda t: t[:2])
+        _, _, callback = _timeouts.pop(0)
+        callback()
+
+
+def cache_path():
+    return os.path.join(_TEMP_DIR, "Cache")
+
+
+def packages_path():
+    return os.path.join(_TEMP_DIR, "Packages")
+
+
+def installed_packages_path():
+    return os.path.join(_TEMP_DIR, "Installed Packages")
+
+
+def executable_path():
+    return os.path.join(_TEMP_DIR, "sublime_text")
+
+
+def find_resources(pattern):
+    return [path for path in RESOURCES if fnmatch.fnmatchcase(path.rpartition("/")[2], pattern)]
+
+
+def load_resource(name):
+    try:
+        return RESOURCES[name]
+    except KeyError:
+        raise FileNotFoundError(name) from None
+
+
+def list_syntaxes():
+    return []
+
+
+_COMMENT_RE = re.compile(r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r'("(?:[^"\\]|\\.)*")|,(\s*[\]}])')
+
+
+def decode_value(data):
+    data = _COMMENT_RE.sub(lambda m: m.group(1) or "", data)
+    data = _TRAILING_COMMA_RE.sub(lambda m: m.group(1) or m.group(2), data)
+    return json.loads(data)
+
+
+def encode_value(value, pretty=False):
+    return json.dumps(value, indent=4 if pretty else None, ensure_ascii=False)
+
+
+def score_selector(scope_name, selector):
+    """Score a scope against a selector.
+
+    Supports alternatives (`|`), exclusions (` - `)
+    and space-separated scope paths of dotted prefixes,
+    but no grouping or descendant ordering.
+    """
+    scopes = scope_name.split()
+    best = 0
+    for alternative in selector.split("|"):
+        include, *excludes = alternative.split(" - ")
+        score = _score_path(scopes, include)
+        if score and not any(_score_path(scopes, exclude) for exclude in excludes):
+            best = max(best, score)
+    return best
+
+
+def _score_path(scopes, path):
+    score = 0
+    for part in path.split():
+        for depth, scope in enumerate(scopes):
+            if scope == part or scope.startswith(part + "."):
+                score = max(score, (depth + 1) * 8 + part.count(".") + 1)
+                break
+        else:
+            return 0
+    return score
+
+
+class Region:
+    __slots__ = ('a', 'b', 'xpos')
+
+    def __init__(self, a, b=None, xpos=-1):
+        if b is None:
+            b = a
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __repr__(self):
+        return f"Region({self.a!r}, {self.b!r})"
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Region) and self.a == rhs.a and self.b == rhs.b
+
+    def __hash__(self):
+        return hash((self.a, self.b))
+
+    def __lt__(self, rhs):
+        return self.begin() < rhs.begin()
+
+    def __contains__(self, v):
+        if isinstance(v, Region):
+            return v.a in self and v.b in self
+        return self.begin() <= v <= self.end()
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+    def size(self):
+        return abs(self.a - self.b)
+
+    def empty(self):
+        return self.a == self.b
+
+    def contains(self, x):
+        return x in self
+
+    def cover(self, rhs):
+        return Region(min(self.begin(), rhs.begin()), max(self.end(), rhs.end()))
+
+    def intersects(self, rhs):
+        lb, le, rb, re_ = self.begin(), self.end(), rhs.begin(), rhs.end()
+        return (lb == rb and le == re_) or (rb > lb and rb < le) or (lb > rb and lb < re_)
+
+
+class CompletionItem:
+    def __init__(
+        self,
+        trigger,
+        annotation="",
+        completion="",
+        completion_format=COMPLETION_FORMAT_TEXT,
+        kind=(KIND_ID_AMBIGUOUS, "", ""),
+        details="",
+    ):
+        self.trigger = trigger
+        self.annotation = annotation
+        self.completion = completion
+        self.completion_format = completion_format
+        self.kind = kind
+        self.details = details
+
+    def __repr__(self):
+        return f"CompletionItem({self.trigger!r}, {self.completion!r})"
+
+    @classmethod
+    def command_completion(cls, trigger, command, args=None, annotation="", kind=None, details=""):
+        kind = kind or (KIND_ID_AMBIGUOUS, "", "")
+        return cls(trigger, annotation, command, COMPLETION_FORMAT_COMMAND, kind, details)
+
+    @classmethod
+    def snippet_completion(cls, trigger, snippet, annotation="", kind=None, details=""):
+        return cls(
+            trigger,
+            annotation,
+            snippet,
+            COMPLETION_FORMAT_SNIPPET,
+            kind or (KIND_ID_SNIPPET, "s", "Snippet"),
+            details,
+        )
+
+
+class Settings:
+    def __init__(self, values=None):
+        self._values = dict(values or {})
+        self._on_change = {}
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def set(self, key, value):
+        self._values[key] = value
+        for callback in list(self._on_change.values()):
+            callback()
+
+    def has(self, key):
+        return key in self._values
+
+    def erase(self, key):
+        self._values.pop(key, None)
+
+    def add_on_change(self, tag, callback):
+        self._on_change[tag] = callback
+
+    def clear_on_change(self, tag):
+        self._on_change.pop(tag, None)
+
+
+_settings = {}
+
+
+def load_settings(base_name):
+    return _settings.setdefault(base_name, Settings())
+
+
+class Window:
+    def __init__(self):
+        self.views = []
+        self.status = None
+
+    def id(self):
+        return 1
+
+    def __eq__(self, other):
+        return isinstance(other, Window)
+
+    def __hash__(self):
+        return 1
+
+    def active_view(self):
+        return self.views[-1] if self.views else None
+
+    def num_groups(self):
+        return 1
+
+    def active_view_in_group(self, group):
+        return self.active_view()
+
+    def status_message(self, msg):
+        self.status = msg
+
+    def focus_view(self, view):
+        if view in self.views:
+            self.views.remove(view)
+            self.views.append(view)
+
+
+_window = Window()
+
+
+def active_window():
+    return _window
+
+
+def windows():
+    return [_window]
+
+
+class Buffer:
+    def __init__(self, buffer_id):
+        self.buffer_id = buffer_id
+
+    def id(self):
+        return self.buffer_id
+
+
+# {view id: view state}
+_views = {}
+_view_ids = itertools.count(1)
+
+
+class View:
+    """A view of a text with fixed scopes.
+
+    Create views with `View.create`.
+    Instances created from an id refer to the same text.
+    """
+
+    def __init__(self, id):
+        self.view_id = id
+
+    @classmethod
+    def create(cls, text, tokens, file_name=None, settings=None):
+        """Create a view of `text` whose scopes are given by sorted `(Region, scope)` tokens."""
+        view = cls(next(_view_ids))
+        _views[view.view_id] = {
+            'text': text,
+            'tokens': tokens,
+            'begins': [region.begin() for region, _ in tokens],
+            'file_name': file_name,
+            'settings': Settings(settings),
+            'change_count': 0,
+            'regions': {},
+            'phantoms': {},
+            'sel': [Region(0)],
+        }
+        _window.views.append(view)
+        return view
+
+    @property
+    def _state(self):
+        return _views[self.view_id]
+
+    def __eq__(self, other):
+        return isinstance(other, View) and self.view_id == other.view_id
+
+    def __hash__(self):
+        return self.view_id
+
+    def __repr__(self):
+        return f"View({self.view_id!r})"
+
+    def set_content(self, text, tokens):
+        """Replace the text and scopes of the view like a modification would."""
+        state = self._state
+        state['text'] = text
+        state['tokens'] = tokens
+        state['begins'] = [region.begin() for region, _ in tokens]
+        state['change_count'] += 1
+
+    def id(self):
+        return self.view_id
+
+    def buffer(self):
+        return Buffer(self.view_id)
+
+    def is_valid(self):
+        return self.view_id in _views
+
+    def close(self):
+        _views.pop(self.view_id, None)
+        if self in _window.views:
+            _window.views.remove(self)
+        return True
+
+    def is_loading(self):
+        return False
+
+    def window(self):
+        return _window if self in _window.views else None
+
+    def file_name(self):
+        return self._state['file_name']
+
+    def settings(self):
+        return self._state['settings']
+
+    def change_count(self):
+        return self._state['change_count']
+
+    def size(self):
+        return len(self._state['text'])
+
+    def substr(self, x):
+        text = self._state['text']
+        if isinstance(x, Region):
+            return text[x.begin() : x.end()]
+        return text[x : x + 1]
+
+    def line(self, x):
+        text = self._state['text']
+        if isinstance(x, Region):
+            begin, end = x.begin(), x.end()
+        else:
+            begin = end = x
+        start = text.rfind("\n", 0, begin) + 1
+        stop = text.find("\n", end)
+        return Region(start, len(text) if stop == -1 else stop)
+
+    def sel(self):
+        return self._state['sel']
+
+    def _token_index(self, point):
+        return bisect.bisect_right(self._state['begins'], point) - 1
+
+    def scope_name(self, point):
+        tokens = self._state['tokens']
+        i = self._token_index(point)
+        if 0 <= i < len(tokens) and tokens[i][0].begin() <= point < tokens[i][0].end():
+            return tokens[i][1]
+        return tokens[0][1].split()[0] + " " if tokens else ""
+
+    def match_selector(self, point, selector):
+        return score_selector(self.scope_name(point), selector) > 0
+
+    def score_selector(self, point, selector):
+        return score_selector(self.scope_name(point), selector)
+
+    def find_by_selector(self, selector):
+        result = []
+        for region, scope in self._state['tokens']:
+            if not score_selector(scope, selector):
+                continue
+            if result and result[-1].end() == region.begin():
+                result[-1] = Region(result[-1].begin(), region.end())
+            else:
+                result.append(Region(region.begin(), region.end()))
+        return result
+
+    def extract_tokens_with_scopes(self, region):
+        begin, end = region.begin(), region.end()
+        tokens = self._state['tokens']
+        i = max(self._token_index(begin), 0)
+        result = []
+        while i < len(tokens) and tokens[i][0].begin() < end:
+            token_region, scope = tokens[i]
+            if token_region.end() > begin:
+                result.append((token_region, scope))
+            i += 1
+        return result
+
+    def find(self, pattern, start_pt, flags=0):
+        match = re.compile(pattern).search(self._state['text'], start_pt)
+        return Region(match.start(), match.end()) if match else Region(-1)
+
+    def add_regions(self, key, regions, scope="", icon="", flags=0, **kwargs):
+        self._state['regions'][key] = list(regions)
+
+    def get_regions(self, key):
+        return list(self._state['regions'].get(key, ()))
+
+    def erase_regions(self, key):
+        self._state['regions'].pop(key, None)
+
+    def add_phantom(self, key, region, content, layout, on_navigate=None):
+        phantoms = self._state['phantoms']
+        phantom_id = len(phantoms) + 1
+        while phantom_id in phantoms:
+            phantom_id += 1
+        phantoms[phantom_id] = (key, region)
+        return phantom_id
+
+    def erase_phantom_by_id(self, phantom_id):
+        self._state['phantoms'].pop(phantom_id, None)
+
+    def erase_phantoms(self, key):
+        phantoms = self._state['phantoms']
+        for phantom_id in [i for i, (k, _) in phantoms.items() if k == key]:
+            del phantoms[phantom_id]
+
+    def query_phantoms(self, phantom_ids):
+        phantoms = self._state['phantoms']
+        return [phantoms[i][1] if i in phantoms else Region(-1) for i in phantom_ids]
+
+    def viewport_extent(self):
+        return (1000.0, 800.0)
+
+    def show_popup(self, content, flags=0, location=-1, max_width=320, max_height=240, **kwargs):
+        self._state['popup'] = content
+
+    def hide_popup(self):
+        self._state.pop('popup', None)
+
+    def is_popup_visible(self):
+        return 'popup' in self._state
+
+    def run_command(self, cmd, args=None):
+        pass
@@ -0,0 +1,40 @@
+"""A stand-in for the parts of `sublime_lib` used by the settings plugins."""
+
+import sublime
+
+__all__ = ('ResourcePath', 'encodings', 'new_view')
+
+
+class ResourcePath(str):
+    """A resource path; only `from_file_path` and `name` are supported."""
+
+    @classmethod
+    def from_file_path(cls, file_path):
+        packages_path = sublime.packages_path()
+        if not file_path.startswith(packages_path):
+            raise ValueError(f"{file_path!r} is not a resource")
+        relative = file_path[len(packages_path) :].replace("\\", "/")
+        return cls("Packages" + relative)
+
+    @property
+    def name(self):
+        return self.rpartition("/")[2]
+
+    @classmethod
+    def glob_resources(cls, pattern):
+        return [cls(path) for path in sublime.find_resources(pattern.rpartition("/")[2])]
+
+
+class encodings:
+    SUBLIME_TO_STANDARD = {
+        "UTF-8": "utf-8",
+        "UTF-16 LE": "utf-16-le",
+        "UTF-16 BE": "utf-16-be",
+        "Western (Windows 1252)": "cp1252",
+    }
+
+
+def new_view(window, *, name="", content="", **kwargs):
+    view = sublime.View.create(content, [])
+    view.name = name
+    return view
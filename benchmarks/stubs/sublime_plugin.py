@@ -0,0 +1,105 @@
+"""A stand-in for the `sublime_plugin` module to run plugin code outside of Sublime Text.
+
+Event listeners are not dispatched automatically;
+benchmarks instantiate and call them directly.
+"""
+
+import sublime
+
+# {view id: [ViewEventListener]}
+_view_event_listeners = {}
+
+
+class EventListener:
+    pass
+
+
+class ViewEventListener:
+    @classmethod
+    def is_applicable(cls, settings):
+        return True
+
+    @classmethod
+    def applies_to_primary_view_only(cls):
+        return True
+
+    def __init__(self, view):
+        self.view = view
+        _view_event_listeners.setdefault(view.id(), []).append(self)
+
+
+class TextChangeListener:
+    @classmethod
+    def is_applicable(cls, buffer):
+        return True
+
+    def __init__(self):
+        self.buffer = None
+
+    def attach(self, buffer):
+        self.buffer = buffer
+
+    def detach(self):
+        self.buffer = None
+
+    def is_attached(self):
+        return self.buffer is not None
+
+
+class Command:
+    def is_enabled(self, *args, **kwargs):
+        return True
+
+    def is_visible(self, *args, **kwargs):
+        return True
+
+
+class ApplicationCommand(Command):
+    pass
+
+
+class WindowCommand(Command):
+    def __init__(self, window):
+        self.window = window
+
+
+class TextCommand(Command):
+    def __init__(self, view):
+        self.view = view
+
+
+class TextChange:
+    def __init__(self, a, b, str):
+        self.a = a
+        self.b = b
+        self.str = str
+
+
+class HistoricPosition:
+    def __init__(self, pt):
+        self.pt = pt
+
+
+def find_view_event_listener(view, cls):
+    for listener in _view_event_listeners.get(view.id(), ()):
+        if isinstance(listener, cls):
+            return listener
+    return None
+
+
+def _unregister_view(view):
+    _view_event_listeners.pop(view.id(), None)
+
+
+__all__ = (
+    'ApplicationCommand',
+    'EventListener',
+    'HistoricPosition',
+    'TextChange',
+    'TextChangeListener',
+    'TextCommand',
+    'ViewEventListener',
+    'WindowCommand',
+    'find_view_event_listener',
+    'sublime',
+)
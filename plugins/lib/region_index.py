@@ -0,0 +1,57 @@
+"""Sorted, per-view indexes of the regions matching a selector.
+
+`view.find_by_selector` scans the whole view.
+The result is cached per view and selector
+until the view's change count changes
+and is searched by bisection.
+"""
+
+from __future__ import annotations
+
+import bisect
+
+import sublime
+
+from .view_cache import ViewCache
+
+__all__ = ('RegionIndex', 'region_index')
+
+_cache = ViewCache()
+
+
+class RegionIndex:
+    """Sorted, non-overlapping regions searchable by point."""
+
+    def __init__(self, regions: list[sublime.Region]) -> None:
+        self.regions = regions
+        self._begins = [region.begin() for region in regions]
+        self._ends: list[int] | None = None
+
+    def at(self, point):
+        """Return the first region containing `point` or None."""
+        i = bisect.bisect_right(self._begins, point) - 1
+        # regions may touch, in which case the earlier one wins
+        for region in self.regions[max(i - 1, 0) : i + 1]:
+            if region.contains(point):
+                return region
+        return None
+
+    def last_starting_at_or_before(self, point):
+        """Return the last region beginning at or before `point` or None."""
+        i = bisect.bisect_right(self._begins, point)
+        return self.regions[i - 1] if i else None
+
+    def last_ending_before(self, point):
+        """Return the last region ending before `point` or None."""
+        if self._ends is None:
+            self._ends = [region.end() for region in self.regions]
+        i = bisect.bisect_left(self._ends, point)
+        return self.regions[i - 1] if i else None
+
+
+def region_index(view, selector) -> RegionIndex:
+    """Return the index of regions in `view` matching `selector`.
+
+    The index is re-built only after the view has been modified.
+    """
+    return _cache.get(view, selector, lambda: RegionIndex(view.find_by_selector(selector)))
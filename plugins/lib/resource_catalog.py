@@ -0,0 +1,159 @@
+"""A shared catalog of resources found by file name pattern and of syntax definitions.
+
+`sublime.find_resources` scans all resources of all packages.
+Its results are cached per pattern, as are `sublime.list_syntaxes` and an index of it,
+until packages are added, removed, upgraded or (un)ignored,
+which is detected by a cheap stamp
+of the package directories and the `ignored_packages` setting.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import threading
+
+import sublime
+
+__all__ = (
+    'find_resources',
+    'invalidate',
+    'invalidate_for_file',
+    'invalidate_syntaxes',
+    'list_syntaxes',
+    'syntax_index',
+)
+
+logger = logging.getLogger(__name__)
+
+# extensions of syntax definitions considered by `syntax_index`
+SYNTAX_EXTENSIONS = frozenset(("sublime-syntax", "tmLanguage"))
+
+_lock = threading.Lock()
+_stamp = None
+# {pattern: (resource, ...)}
+_catalog: dict[str, tuple[str, ...]] = {}
+# result of `sublime.list_syntaxes`
+_syntaxes: tuple[sublime.Syntax, ...] | None = None
+# {base name without extension: syntax path}
+_syntax_index: dict[str, str] | None = None
+
+
+def _dir_stamp(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _packages_stamp():
+    """Return a value that changes whenever packages are added, removed or upgraded.
+
+    Adding, removing or replacing an archive or package folder
+    changes the modification time of its parent directory.
+    Package managers ignore packages while upgrading them.
+    """
+    ignored = sublime.load_settings("Preferences.sublime-settings").get("ignored_packages")
+    return (
+        _dir_stamp(sublime.packages_path()),
+        _dir_stamp(sublime.installed_packages_path()),
+        tuple(ignored) if isinstance(ignored, list) else None,
+    )
+
+
+def _check_stamp():
+    """Drop all cached data if packages changed and return the current stamp.
+
+    Must be called with `_lock` held.
+    """
+    global _stamp, _syntaxes, _syntax_index
+    stamp = _packages_stamp()
+    if stamp != _stamp:
+        if _stamp is not None:
+            logger.debug("packages changed, clearing resource catalog")
+        _catalog.clear()
+        _syntaxes = _syntax_index = None
+        _stamp = stamp
+    return stamp
+
+
+def find_resources(pattern: str) -> tuple[str, ...]:
+    """Return the resources matching `pattern` like `sublime.find_resources`, but cached."""
+    with _lock:
+        stamp = _check_stamp()
+        resources = _catalog.get(pattern)
+    if resources is None:
+        resources = tuple(sublime.find_resources(pattern))
+        with _lock:
+            if _stamp == stamp:
+                _catalog[pattern] = resources
+    return resources
+
+
+def list_syntaxes() -> tuple[sublime.Syntax, ...]:
+    """Return all syntax definitions like `sublime.list_syntaxes`, but cached.
+
+    The same tuple is returned until syntax definitions may have been added or removed.
+    """
+    global _syntaxes
+    with _lock:
+        stamp = _check_stamp()
+        syntaxes = _syntaxes
+    if syntaxes is None:
+        syntaxes = tuple(sublime.list_syntaxes())
+        with _lock:
+            if _stamp == stamp:
+                _syntaxes = syntaxes
+    return syntaxes
+
+
+def syntax_index() -> dict[str, str]:
+    """Return the paths of all syntax definitions keyed by their base name without extension.
+
+    If several syntax definitions share a base name, the first one listed wins.
+    The result must not be modified.
+    """
+    global _syntax_index
+    with _lock:
+        stamp = _check_stamp()
+        index = _syntax_index
+    if index is None:
+        index: dict[str, str] = {}
+        for syntax in list_syntaxes():
+            base_name, _, ext = syntax.path.rpartition("/")[2].rpartition(".")
+            if ext in SYNTAX_EXTENSIONS:
+                index.setdefault(base_name, syntax.path)
+        with _lock:
+            if _stamp == stamp:
+                _syntax_index = index
+    return index
+
+
+def invalidate():
+    """Drop all cached resource lists and syntax definitions."""
+    global _syntaxes, _syntax_index
+    with _lock:
+        _catalog.clear()
+        _syntaxes = _syntax_index = None
+
+
+def invalidate_for_file(file_name: str):
+    """Drop the cached resource lists a (new or modified) file may belong to.
+
+    Use this for files that could have been added within a package,
+    which is not detected automatically.
+    Syntax definitions are handled by `invalidate_syntaxes`.
+    """
+    base_name = os.path.basename(file_name)
+    with _lock:
+        for pattern in [p for p in _catalog if fnmatch.fnmatchcase(base_name, p)]:
+            logger.debug("invalidating resource catalog for %r", pattern)
+            del _catalog[pattern]
+
+
+def invalidate_syntaxes():
+    """Drop the cached syntax definitions, e.g. after one was added within a package."""
+    global _syntaxes, _syntax_index
+    with _lock:
+        _syntaxes = _syntax_index = None
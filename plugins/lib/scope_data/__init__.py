@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import logging
+from typing import Dict
 
 import sublime
 
-from .data import DATA
-
 __all__ = [
     "COMPILED_NODES",
     "COMPILED_HEADS",
@@ -44,19 +43,23 @@ class ScopeNode:
     Methods:
         * add_child(child)
         * tree()
+
+    Nodes compare and hash by identity.
     """
 
+    __slots__ = ('name', 'parent', 'children', 'level')
+
     def __init__(self, name, parent=None, children=None):
         self.name = name
         self.parent = parent
-        self.children = children or NodeSet()
+        # leaves share an empty set until they get a child
+        self.children = children or _NO_CHILDREN
         self.level = parent and parent.level + 1 or 1
 
-    def __hash__(self):
-        return hash(str(self))
-
     def add_child(self, child):
-        self.children.add(child)
+        if self.children is _NO_CHILDREN:
+            self.children = NodeSet()
+        return self.children.add(child)
 
     def tree(self):
         if self.parent:
@@ -64,93 +67,126 @@ class ScopeNode:
         else:
             return self.name
 
-    def __eq__(self, other):
-        if isinstance(other, str):
-            return str(self) == other
-        elif isinstance(other, ScopeNode):
-            return (
-                self.name == other.name
-                and self.parent == other.parent
-                and self.children == other.children
-            )
-        else:
-            return NotImplemented
-
     def __str__(self):
         return self.name
 
     def __repr__(self):
         ret = self.name
         if self.children:
-            ret += " {{{}}}".format(' '.join(map(repr, self.children)))
+            ret += " {{{}}}".format(' '.join(map(repr, self.children.values())))
         return ret
 
 
-class NodeSet(set[ScopeNode]):
-    """
+class NodeSet(Dict[str, ScopeNode]):
+    """Sibling nodes indexed by their name.
+
     Methods:
+        * add(node)
         * find(name)
         * find_all(name)
         * to_completion()
     """
 
+    __slots__ = ('_completions',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._completions = None
+
+    def add(self, node):
+        """Add a node, merging it with an existing sibling of the same name.
+
+        Returns the node that is part of the set.
+        """
+        existing = self.setdefault(node.name, node)
+        if existing is not node:
+            for child in node.children.values():
+                child.parent = existing
+                existing.add_child(child)
+        self._completions = None
+        return existing
+
     def find(self, name):
-        for node in self:
-            if node == name:
-                return node
-        return None
+        return self.get(name)
 
     def find_all(self, name):
-        res = NodeSet()
-        for node in self:
-            if node == name:
-                res.add(node)
-        return res
+        node = self.get(name)
+        return NodeSet({name: node}) if node else NodeSet()
 
     def to_completion(self):
-        return [create_scope_completion(n.name) for n in self]
+        """Return the completions for all nodes.
 
+        The list is built once and shared; do not modify it.
+        """
+        if self._completions is None:
+            self._completions = [create_scope_completion(name) for name in self]
+        return self._completions
 
-#######################################
 
-# output values
-COMPILED_NODES = NodeSet()
-COMPILED_HEADS = NodeSet()
-
-# parse the DATA string
-lines = DATA.split("\n")
-
-# some variables
-indent = " " * 4
-indent_level = 0
-indents: dict[int, ScopeNode] = {}
-
-# process lines
-# Note: expects sane indentation (such as only indent by 1 `indent` at a time)
-for line in lines:
-    if line.isspace() or not len(line):
-        # skip blank lines
-        continue
-    if line.startswith(indent * (indent_level + 1)):
-        # indent increased
-        indent_level += 1
-    if not line.startswith(indent * indent_level):
-        # indent decreased
-        for level in range(indent_level - 1, 0, -1):
-            if line.startswith(indent * level):
-                indent_level = level
-                break
-
-    parent = indents[indent_level - 1] if indent_level - 1 in indents else None
-    node = ScopeNode(line.strip(), parent)
-    indents[indent_level] = node
-
-    if parent:
-        parent.add_child(node)
-    else:
-        COMPILED_HEADS.add(node)
+_NO_CHILDREN = NodeSet()
+
+
+#######################################
 
-    COMPILED_NODES.add(node)
+# output values, built on first access
+# COMPILED_NODES: list[ScopeNode]
+# COMPILED_HEADS: NodeSet
+
+
+def _build_tree():
+    """Parse the DATA string into the list of all nodes and the head nodes."""
+    from .data import DATA
+
+    nodes: list[ScopeNode] = []
+    heads = NodeSet()
+
+    # some variables
+    indent = " " * 4
+    indent_level = 0
+    indents: dict[int, ScopeNode] = {}
+
+    # process lines
+    # Note: expects sane indentation (such as only indent by 1 `indent` at a time)
+    for line in DATA.split("\n"):
+        if line.isspace() or not len(line):
+            # skip blank lines
+            continue
+        if line.startswith(indent * (indent_level + 1)):
+            # indent increased
+            indent_level += 1
+        if not line.startswith(indent * indent_level):
+            # indent decreased
+            for level in range(indent_level - 1, 0, -1):
+                if line.startswith(indent * level):
+                    indent_level = level
+                    break
+
+        parent = indents[indent_level - 1] if indent_level - 1 in indents else None
+        node = ScopeNode(line.strip(), parent)
+        # duplicate entries are merged into the first one
+        added = parent.add_child(node) if parent else heads.add(node)
+        if added is node:
+            nodes.append(node)
+        indents[indent_level] = added
+
+    return nodes, heads
+
+
+def __getattr__(name):
+    # Build the tree only when it is first used,
+    # since many sessions never edit a syntax definition or color scheme.
+    if name in ('COMPILED_NODES', 'COMPILED_HEADS'):
+        logger.debug("Building scope naming convention tree")
+        nodes, heads = _build_tree()
+        # module globals take precedence over __getattr__ from now on
+        globals().update(COMPILED_NODES=nodes, COMPILED_HEADS=heads)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _compiled_heads():
+    heads = globals().get('COMPILED_HEADS')
+    return heads if heads is not None else __getattr__('COMPILED_HEADS')
 
 
 # Tokenize the current selector
@@ -159,10 +195,10 @@ def completions_from_prefix(prefix):
     tokens = prefix.split(".")
     if len(tokens) <= 1:
         # No work to be done here, just return the heads
-        return COMPILED_HEADS.to_completion()
+        return _compiled_heads().to_completion()
 
     # Browse the nodes and their children
-    nodes = COMPILED_HEADS
+    nodes = _compiled_heads()
     for i, token in enumerate(tokens[:-1]):
         node = nodes.find(token)
         if not node:
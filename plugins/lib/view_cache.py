@@ -0,0 +1,53 @@
+"""Per-view storage of data derived from a view's content.
+
+Entries are valid until the view's change count changes
+and are dropped once their view has been closed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import sublime
+
+__all__ = ('ViewCache',)
+
+
+class ViewCache:
+    """Values built from the content of views, keyed by view and an arbitrary key."""
+
+    def __init__(self) -> None:
+        # {view_id: {key: (change_count, value)}}
+        self._entries: dict[int, dict[Hashable, tuple[int, Any]]] = {}
+
+    def get(self, view, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the value for `key` in `view`, calling `build` if there is no current one.
+
+        Values built while the view is loading are not stored.
+        """
+        view_id = view.id()
+        change_count = view.change_count()
+        view_entries = self._entries.get(view_id)
+        if view_entries is None:
+            self._prune()
+            view_entries = self._entries[view_id] = {}
+
+        cached = view_entries.get(key)
+        if cached and cached[0] == change_count:
+            return cached[1]
+
+        value = build()
+        if not view.is_loading():
+            view_entries[key] = (change_count, value)
+        return value
+
+    def clear(self):
+        """Drop all values, e.g. when they depend on data outside of the view."""
+        self._entries.clear()
+
+    def _prune(self):
+        """Drop values of closed views."""
+        for view_id in list(self._entries):
+            if not sublime.View(view_id).is_valid():
+                self._entries.pop(view_id, None)
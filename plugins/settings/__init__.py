@@ -1,13 +1,18 @@
 import html
 import logging
 import os
+import re
 
 import sublime
 import sublime_plugin
+from sublime_lib import new_view
 
-from ..lib import get_setting, inhibit_word_completions, syntax_paths
+from ..lib import get_setting, inhibit_word_completions, resource_catalog, syntax_paths
+from ..lib.region_index import region_index
 from ..lib.view_utils import region_flags_from_strings
 from ..lib.weakmethod import WeakMethodProxy
+from .index_cache import clear_index_cache
+from .index_stats import count_decoded, estimate_shared_size, render_stats
 from .known_settings import PREF_FILE, KnownSettings
 from .region_math import (
     KEY_COMPLETIONS_SCOPE,
@@ -20,6 +25,8 @@ from .region_math import (
 __all__ = (
     'SettingsListener',
     'GlobalSettingsListener',
+    'PackagedevClearSettingsIndexCacheCommand',
+    'PackagedevShowIndexStatsCommand',
 )
 
 POPUP_TEMPLATE = """
@@ -96,6 +103,18 @@ WIDGET_SETTINGS_NAMES = {
 # user package pattern
 USER_PATH = f"{os.sep}Packages{os.sep}User{os.sep}"
 
+# delay in ms to coalesce bursts of modifications before linting
+LINT_DELAY = 100
+# delay in ms to coalesce bursts of modifications before updating phantoms
+PHANTOM_DELAY = 250
+# delay in ms after saving a syntax definition to list all syntaxes again
+SYNTAX_INDEX_DELAY = 2000
+PHANTOM_KEY = "sublime-settings-edit"
+
+# Inserting any of these characters or deleting text
+# may change the scopes after the modified lines.
+STRUCTURAL_CHANGE_RE = re.compile(r'[\[\]{}"/*\\:,]')
+
 logger = logging.getLogger(__name__)
 
 
@@ -108,6 +127,55 @@ def is_widget_file(filename):
     )
 
 
+def _track_change(dirty, begin, old_end, new_end):
+    """Map a dirty region through a text change and extend it by the changed text.
+
+    Arguments:
+        dirty (sublime.Region or None):
+            The region modified by previous changes.
+        begin (int):
+            The start of the replaced text.
+        old_end (int):
+            The end of the replaced text before the change.
+        new_end (int):
+            The end of the inserted text after the change.
+    """
+    if dirty is None:
+        return sublime.Region(begin, new_end)
+    delta = new_end - old_end
+    a, b = dirty.begin(), dirty.end()
+    if a >= old_end:
+        a += delta
+    elif a > begin:
+        a = begin
+    if b >= old_end:
+        b += delta
+    elif b > begin:
+        b = new_end
+    return sublime.Region(min(a, begin), max(b, new_end))
+
+
+class _TextChangeTracker(sublime_plugin.TextChangeListener):
+    """Forward text changes of a buffer to a callback.
+
+    Attached manually by `SettingsListener` for each of its views.
+    """
+
+    @classmethod
+    def is_applicable(cls, buffer):
+        return False
+
+    def __init__(self, on_changed):
+        super().__init__()
+        self.on_changed = on_changed
+
+    def on_text_changed_async(self, changes):
+        try:
+            self.on_changed(changes)
+        except ReferenceError:
+            pass
+
+
 class SettingsListener(sublime_plugin.ViewEventListener):
     is_completing_key = False
 
@@ -139,25 +207,109 @@ class SettingsListener(sublime_plugin.ViewEventListener):
             elif filepath.endswith(".sublime-settings"):
                 self.known_settings = KnownSettings.load(filename)
 
+        # text modified since the last linting,
+        # or None if there are structural changes requiring a full linting pass
+        self._dirty_region = None
+        self._needs_full_lint = True
+        self._lint_request = 0
+        self._linted_change_count = None
+        # whether a full linting pass is postponed until the view is shown
+        self._lint_deferred = False
+        self._change_tracker = _TextChangeTracker(WeakMethodProxy(self._on_text_changed))
+        self._change_tracker.attach(view.buffer())
+
         if self.known_settings:
-            self.known_settings.add_on_loaded(self.do_linting)
+            self.known_settings.add_on_loaded(self._on_settings_loaded)
         else:
             logger.error("Not a Sublime Text Settings or Project file: %r", filepath)
 
-        self.phantom_set = sublime.PhantomSet(self.view, "sublime-settings-edit")
-        if self._is_base_settings_view() and get_setting("settings.show_quick_edit_icon"):
+        # phantom ids keyed by the key name and position they were added for
+        self._phantoms = {}
+        self._phantom_request = 0
+        if self._shows_quick_edit_icons() and not view.is_loading():
             self.build_phantoms()
 
     def __del__(self):
         logger.debug("deleting SettingsListener instance for %r", self.view.file_name())
+        if self._change_tracker.is_attached():
+            self._change_tracker.detach()
         self.view.erase_regions('unknown_settings_keys')
-        self.phantom_set.update([])
+        self.view.erase_phantoms(PHANTOM_KEY)
+
+    def _on_text_changed(self, changes):
+        """Collect the modified text and schedule linting."""
+        for change in changes:
+            begin, old_end = change.a.pt, change.b.pt
+            if old_end > begin or STRUCTURAL_CHANGE_RE.search(change.str):
+                self._needs_full_lint = True
+            self._dirty_region = _track_change(
+                self._dirty_region, begin, old_end, begin + len(change.str)
+            )
+
+        self._lint_request += 1
+        request = self._lint_request
+        sublime.set_timeout_async(lambda: self._run_scheduled_lint(request), LINT_DELAY)
+
+    def _on_settings_loaded(self):
+        """Schedule a full linting pass after the known settings have been (re-)loaded.
+
+        Multiple reloads in a short time result in a single pass.
+        The focused view is linted first, other visible views shortly after
+        and hidden views once they are activated.
+        """
+        self._needs_full_lint = True
+        self._linted_change_count = None
+        self._lint_request += 1
+        delay = self._lint_delay()
+        self._lint_deferred = delay is None
+        if not self._lint_deferred:
+            request = self._lint_request
+            sublime.set_timeout_async(lambda: self._run_scheduled_lint(request), delay)
+
+    def _lint_delay(self):
+        """Return the delay for linting based on the view's visibility or None if hidden."""
+        window = self.view.window()
+        if not window:
+            return None
+        if window == sublime.active_window() and window.active_view() == self.view:
+            return 0
+        for group in range(window.num_groups()):
+            if window.active_view_in_group(group) == self.view:
+                return LINT_DELAY
+        return None
+
+    def on_activated_async(self):
+        if self._lint_deferred:
+            self._lint_deferred = False
+            self._lint_request += 1
+            self._run_scheduled_lint(self._lint_request)
+
+    def _run_scheduled_lint(self, request):
+        if request != self._lint_request:
+            # superseded by a later modification
+            return
+        if self.view.change_count() == self._linted_change_count:
+            return
+        if self._needs_full_lint or self._dirty_region is None:
+            self.do_linting()
+        else:
+            self._lint_region(self._dirty_region)
+
+    def on_load_async(self):
+        """Sublime Text load event handler to add phantoms once the file is loaded."""
+        if self._shows_quick_edit_icons():
+            self.build_phantoms()
 
     def on_modified_async(self):
-        """Sublime Text modified event handler to update linting."""
-        self.do_linting()
-        if self._is_base_settings_view() and get_setting("settings.show_quick_edit_icon"):
+        """Sublime Text modified event handler to schedule updating phantoms."""
+        if self._shows_quick_edit_icons():
             # This may only occur for unpacked packages
+            self._phantom_request += 1
+            request = self._phantom_request
+            sublime.set_timeout_async(lambda: self._run_scheduled_phantoms(request), PHANTOM_DELAY)
+
+    def _run_scheduled_phantoms(self, request):
+        if request == self._phantom_request:
             self.build_phantoms()
 
     @inhibit_word_completions
@@ -241,21 +393,66 @@ class SettingsListener(sublime_plugin.ViewEventListener):
                 user_view.show_at_center(result.end())
                 user_view.sel().add(result.end() + 2)
 
-    def do_linting(self):
-        """Highlight all unknown settings keys."""
-        unknown_regions = None
+    def _is_linting_enabled(self):
         file_name = self.view.file_name() or ""
-        if (
+        return bool(
             self.known_settings
             and (USER_PATH in file_name or file_name.endswith(".sublime-project"))
             and get_setting('settings.linting')
-        ):
+        )
+
+    def _reset_lint_state(self):
+        self._dirty_region = None
+        self._needs_full_lint = False
+        self._linted_change_count = self.view.change_count()
+
+    def do_linting(self):
+        """Highlight all unknown settings keys."""
+        self._lint_deferred = False
+        self._reset_lint_state()
+        unknown_regions = None
+        if self._is_linting_enabled():
+            known_keys = self.known_settings.keys()
             unknown_regions = [
                 region
-                for region in self.view.find_by_selector(KEY_SCOPE)
-                if self.view.substr(region) not in self.known_settings
+                for region in region_index(self.view, KEY_SCOPE).regions
+                if self.view.substr(region) not in known_keys
             ]
+        self._set_unknown_regions(unknown_regions)
+
+    def _lint_region(self, region):
+        """Re-check the keys on the lines of `region` and patch the highlighted regions."""
+        self._reset_lint_state()
+        if not self._is_linting_enabled():
+            self._set_unknown_regions(None)
+            return
+
+        lines = self.view.line(region)
+        known_keys = self.known_settings.keys()
+        unknown_regions = [
+            r for r in self.view.get_regions('unknown_settings_keys') if not lines.contains(r)
+        ]
+        unknown_regions += [
+            r for r in self._key_regions_in(lines) if self.view.substr(r) not in known_keys
+        ]
+        unknown_regions.sort()
+        logger.debug("re-linted %r in %r", lines, self.view.file_name())
+        self._set_unknown_regions(unknown_regions)
+
+    def _key_regions_in(self, region):
+        """Return the regions of settings keys within `region`."""
+        key_regions = []
+        for token_region, scope in self.view.extract_tokens_with_scopes(region):
+            if not sublime.score_selector(scope, KEY_SCOPE):
+                continue
+            if key_regions and key_regions[-1].end() == token_region.begin():
+                # keys with escape sequences consist of multiple tokens
+                key_regions[-1] = key_regions[-1].cover(token_region)
+            else:
+                key_regions.append(token_region)
+        return key_regions
 
+    def _set_unknown_regions(self, unknown_regions):
         if unknown_regions:
             styles = get_setting(
                 'settings.highlight_styles',
@@ -272,30 +469,55 @@ class SettingsListener(sublime_plugin.ViewEventListener):
             self.view.erase_regions('unknown_settings_keys')
 
     def build_phantoms(self):
-        """Add links to side-by-side base file for editing this setting in the user file."""
+        """Add links to side-by-side base file for editing this setting in the user file.
+
+        Phantoms move along with the text,
+        so only those of added, removed or renamed keys are updated.
+        """
         if self.view.is_loading():
-            sublime.set_timeout(self.build_phantoms, 20)
+            # called again by `on_load_async`
             return
-        logger.debug("Building phantom set for view %r", self.view.file_name())
-        key_regions = self.view.find_by_selector(KEY_SCOPE)
-        phantoms = []
-        for region in key_regions:
-            key_name = self.view.substr(region)
-            phantom_region = sublime.Region(region.end() + 1)  # before colon
+        logger.debug("Updating phantoms for view %r", self.view.file_name())
+
+        wanted = {
+            (self.view.substr(region), region.end() + 1)  # before colon
+            for region in region_index(self.view, KEY_SCOPE).regions
+        }
+
+        # Existing phantoms are looked up by their current positions
+        # and erased if their key was removed or renamed.
+        phantom_ids = list(self._phantoms)
+        phantoms = {}
+        for phantom_id, region in zip(phantom_ids, self.view.query_phantoms(phantom_ids)):
+            phantom_key = (self._phantoms[phantom_id], region.a)
+            if region.a == -1 or phantom_key not in wanted or phantom_key in phantoms:
+                self.view.erase_phantom_by_id(phantom_id)
+            else:
+                phantoms[phantom_key] = phantom_id
+
+        num_kept = len(phantoms)
+        for key_name, point in wanted - phantoms.keys():
             content = f"<a href=\"edit:{html.escape(key_name)}\">✏</a>"
-            phantoms.append(
-                sublime.Phantom(
-                    region=phantom_region,
-                    content=PHANTOM_TEMPLATE.format(content),
-                    layout=sublime.LAYOUT_INLINE,
-                    # use weak reference for callback
-                    # to allow for phantoms to be cleaned up in __del__
-                    on_navigate=WeakMethodProxy(self.on_navigate),
-                )
+            phantoms[key_name, point] = self.view.add_phantom(
+                PHANTOM_KEY,
+                sublime.Region(point),
+                PHANTOM_TEMPLATE.format(content),
+                sublime.LAYOUT_INLINE,
+                # use weak reference for callback
+                # to allow for phantoms to be cleaned up in __del__
+                WeakMethodProxy(self.on_navigate),
             )
-        logger.debug("Made %d phantoms", len(phantoms))
+        logger.debug(
+            "Kept %d, removed %d and added %d phantoms",
+            num_kept,
+            len(phantom_ids) - num_kept,
+            len(phantoms) - num_kept,
+        )
 
-        self.phantom_set.update(phantoms)
+        self._phantoms = {phantom_id: key[0] for key, phantom_id in phantoms.items()}
+
+    def _shows_quick_edit_icons(self):
+        return self._is_base_settings_view() and get_setting("settings.show_quick_edit_icon")
 
     def _is_base_settings_view(self):
         return self.view.settings().get('edit_settings_view') == 'base'
@@ -327,6 +549,53 @@ class GlobalSettingsListener(sublime_plugin.EventListener):
                 listener.show_popup_for(key_region)
 
     def on_post_save(self, view):
+        file_name = view.file_name()
+        if file_name:
+            # color schemes or themes may have been added
+            resource_catalog.invalidate_for_file(file_name)
+            if file_name.rpartition(".")[2] in resource_catalog.SYNTAX_EXTENSIONS:
+                # this may be a new syntax definition,
+                # which Sublime Text may list only after it has been indexed
+                resource_catalog.invalidate_syntaxes()
+                sublime.set_timeout_async(resource_catalog.invalidate_syntaxes, SYNTAX_INDEX_DELAY)
         listener = sublime_plugin.find_view_event_listener(view, SettingsListener)
-        if listener and listener.known_settings:
-            listener.known_settings.trigger_settings_reload()
+        if listener and listener.known_settings and file_name:
+            listener.known_settings.trigger_file_reload(file_name)
+
+
+class PackagedevClearSettingsIndexCacheCommand(sublime_plugin.WindowCommand):
+    """Remove the on-disk settings index cache and re-index all open settings.
+
+    Cached resource lists, e.g. of color schemes and themes, are dropped as well.
+    """
+
+    def run(self):
+        clear_index_cache()
+        resource_catalog.invalidate()
+        for known_settings in list(KnownSettings.cache.values()):
+            known_settings.trigger_settings_reload()
+        self.window.status_message("[PackageDev] Settings index cache cleared")
+
+
+class PackagedevShowIndexStatsCommand(sublime_plugin.WindowCommand):
+    """Show load timings and sizes of all indexed settings files in a new view."""
+
+    def run(self):
+        instances = [known_settings for _, known_settings in sorted(KnownSettings.cache.items())]
+        mappings = [
+            mapping
+            for known_settings in instances
+            for layer in known_settings.layers.values()
+            for mapping in layer
+        ]
+        new_view(
+            self.window,
+            name="PackageDev Index Stats",
+            content=render_stats(
+                [ks.stats for ks in instances],
+                estimate_shared_size(mappings),
+                count_decoded(mappings),
+            ),
+            scratch=True,
+            read_only=True,
+        )
@@ -0,0 +1,164 @@
+"""Persistent on-disk cache of parsed settings resources.
+
+Parsing all base files of a settings file name is expensive
+when many packages are installed,
+so the raw values and comments of each resource
+are stored in the cache path
+and only re-parsed when the resource has changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+
+import sublime
+
+__all__ = (
+    'CACHE_VERSION',
+    'SettingsIndexCache',
+    'clear_index_cache',
+    'content_stamp',
+    'resource_stamp',
+)
+
+# Bump this whenever the format of the stored entries changes.
+CACHE_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_dir():
+    return os.path.join(sublime.cache_path(), "PackageDev", "SettingsIndex")
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def resource_stamp(resource):
+    """Return a string identifying the current state of a resource or None.
+
+    The stamp is derived from the modification time and size
+    of the unpacked file
+    or of the archive the resource is loaded from.
+    `None` is returned if the resource's origin could not be determined.
+    """
+    root, _, rest = resource.partition("/")
+    package, _, path = rest.partition("/")
+    if root != "Packages" or not path:
+        return None
+
+    unpacked = os.path.join(sublime.packages_path(), package, *path.split("/"))
+    if stamp := _file_stamp(unpacked):
+        return "file:" + stamp
+
+    archive_name = package + ".sublime-package"
+    for archive_dir in (
+        sublime.installed_packages_path(),
+        os.path.join(os.path.dirname(sublime.executable_path()), "Packages"),
+    ):
+        if stamp := _file_stamp(os.path.join(archive_dir, archive_name)):
+            return "archive:" + stamp
+    return None
+
+
+def content_stamp(content):
+    """Return a stamp for a resource based on its content."""
+    return "sha1:" + hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def clear_index_cache():
+    """Remove all cached settings indexes from disk."""
+    cache_dir = _cache_dir()
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError as e:
+            logger.warning("unable to remove cache file %r - %s", name, e)
+    logger.info("cleared settings index cache")
+
+
+class SettingsIndexCache:
+    """Tokenized values and comments of all resources of a settings file name.
+
+    Entries are keyed by the resource path
+    and considered valid only for the stamp they were stored with.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.path = os.path.join(_cache_dir(), filename + ".json")
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._used: set[str] = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, filename: str) -> SettingsIndexCache:
+        """Load the cache for a settings file name, discarding incompatible data."""
+        obj = cls(filename)
+        try:
+            with open(obj.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return obj
+        except (OSError, ValueError) as e:
+            logger.warning("unable to read settings index cache %r - %s", obj.path, e)
+            return obj
+
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            logger.debug("discarding outdated settings index cache %r", obj.path)
+            obj._dirty = True
+        else:
+            obj.entries = data.get('resources', {})
+        return obj
+
+    def get(self, resource, stamp):
+        """Return the cached `(raw_values, comments)` for a resource or None if outdated."""
+        self._used.add(resource)
+        entry = self.entries.get(resource)
+        if entry and entry.get('stamp') == stamp:
+            return entry['values'], entry['comments']
+        return None
+
+    def put(self, resource, stamp, raw_values, comments):
+        self._used.add(resource)
+        self.entries[resource] = {'stamp': stamp, 'values': raw_values, 'comments': comments}
+        self._dirty = True
+
+    def save(self, prune=False):
+        """Write the cache to disk if it changed.
+
+        Arguments:
+            prune (bool):
+                Whether to drop entries of resources not accessed since loading,
+                i.e. resources that vanished.
+        """
+        if prune:
+            for resource in self.entries.keys() - self._used:
+                del self.entries[resource]
+                self._dirty = True
+        if not self._dirty:
+            return
+
+        data = {'version': CACHE_VERSION, 'resources': self.entries}
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("unable to write settings index cache %r - %s", self.path, e)
+        else:
+            self._dirty = False
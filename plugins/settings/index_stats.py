@@ -0,0 +1,205 @@
+"""Timings and size estimates collected while indexing settings resources."""
+
+from __future__ import annotations
+
+import sys
+import threading
+
+__all__ = (
+    'IndexStats',
+    'ResourceStats',
+    'count_decoded',
+    'estimate_shared_size',
+    'estimate_size',
+    'render_stats',
+)
+
+
+def estimate_size(mapping):
+    """Estimate the memory used by a flat mapping of strings in bytes.
+
+    Only the mapping itself and its keys and string values are accounted for.
+    """
+    size = sys.getsizeof(mapping)
+    for key, value in getattr(mapping, 'raw', mapping).items():
+        size += sys.getsizeof(key)
+        if isinstance(value, str):
+            size += sys.getsizeof(value)
+    return size
+
+
+def estimate_shared_size(mappings):
+    """Estimate the memory used by several flat mappings of strings in bytes.
+
+    Returns:
+        (int, int):
+            The size if every key and value was a separate object
+            and the size counting each distinct object only once,
+            i.e. after interning.
+    """
+    total = unique = 0
+    seen = set()
+    for mapping in mappings:
+        size = sys.getsizeof(mapping)
+        total += size
+        unique += size
+        for key, value in getattr(mapping, 'raw', mapping).items():
+            for obj in (key, value) if isinstance(value, str) else (key,):
+                size = sys.getsizeof(obj)
+                total += size
+                if id(obj) not in seen:
+                    seen.add(id(obj))
+                    unique += size
+    return total, unique
+
+
+def count_decoded(mappings):
+    """Count the decoded values kept by lazily decoding mappings.
+
+    Mappings without a `num_decoded` attribute are ignored.
+
+    Returns:
+        (int, int):
+            The number of decoded values kept
+            and the number of values in these mappings.
+    """
+    decoded = total = 0
+    for mapping in mappings:
+        num_decoded = getattr(mapping, 'num_decoded', None)
+        if num_decoded is not None:
+            decoded += num_decoded
+            total += len(mapping)
+    return decoded, total
+
+
+class ResourceStats:
+    """Statistics of indexing a single resource.
+
+    Durations are in seconds, sizes in bytes.
+    """
+
+    def __init__(self, resource: str) -> None:
+        self.resource = resource
+        self.cached = False
+        self.load_time = 0.0
+        self.parse_time = 0.0
+        self.num_keys = 0
+        self.num_comments = 0
+        self.values_size = 0
+        self.comments_size = 0
+        self.error: str | None = None
+
+    @property
+    def total_time(self):
+        return self.load_time + self.parse_time
+
+    @property
+    def size(self):
+        return self.values_size + self.comments_size
+
+
+class IndexStats:
+    """Statistics of the most recent (re-)load of a `KnownSettings` instance.
+
+    Durations are in seconds, sizes in bytes.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.find_time = 0.0
+        self.index_time = 0.0
+        self.merge_time = 0.0
+        self.resources: dict[str, ResourceStats] = {}
+        # resources are indexed from a thread pool
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.find_time = self.index_time = self.merge_time = 0.0
+            self.resources = {}
+
+    def add(self, stats: ResourceStats):
+        with self._lock:
+            self.resources[stats.resource] = stats
+
+    @property
+    def num_keys(self):
+        return sum(stats.num_keys for stats in self.resources.values())
+
+    @property
+    def num_comments(self):
+        return sum(stats.num_comments for stats in self.resources.values())
+
+    @property
+    def size(self):
+        return sum(stats.size for stats in self.resources.values())
+
+    @property
+    def total_time(self):
+        return self.find_time + self.index_time + self.merge_time
+
+
+def _format_size(size):
+    for unit in ("B", "KiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} MiB"
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.1f}"
+
+
+def render_stats(all_stats, shared_size=None, decoded=None):
+    """Render the statistics of several settings files as a plain text report.
+
+    Resources are sorted by the time it took to index them, slowest first.
+
+    Arguments:
+        all_stats (list of IndexStats):
+            The statistics to render.
+        shared_size ((int, int)):
+            The result of `estimate_shared_size` for all indexed mappings.
+        decoded ((int, int)):
+            The result of `count_decoded` for all indexed mappings.
+    """
+    lines = []
+    if shared_size and all_stats:
+        total, unique = shared_size
+        lines.append(
+            f"memory: {_format_size(unique)} of {_format_size(total)}"
+            f" without sharing strings ({_format_size(total - unique)} saved)"
+        )
+        if decoded:
+            num_decoded, num_values = decoded
+            lines.append(f"decoded values kept: {num_decoded} of {num_values}")
+        lines.append("")
+    for stats in all_stats:
+        lines += [
+            f"{stats.filename}",
+            "=" * len(stats.filename),
+            "",
+            f"resources: {len(stats.resources)}"
+            f", keys: {stats.num_keys}"
+            f", comments: {stats.num_comments}"
+            f", size: {_format_size(stats.size)}",
+            f"find: {stats.find_time * 1000:.1f} ms"
+            f", index: {stats.index_time * 1000:.1f} ms"
+            f", merge: {stats.merge_time * 1000:.1f} ms"
+            f", total: {stats.total_time * 1000:.1f} ms",
+            "",
+            "load ms  parse ms   keys  comments      size  resource",
+        ]
+        resources = sorted(stats.resources.values(), key=lambda s: s.total_time, reverse=True)
+        for res in resources:
+            note = " (cached)" if res.cached else ""
+            if res.error:
+                note += f" (error: {res.error})"
+            lines.append(
+                f"{_ms(res.load_time)} {_ms(res.parse_time)}"
+                f" {res.num_keys:6d} {res.num_comments:9d}"
+                f" {_format_size(res.size):>9}  {res.resource}{note}"
+            )
+        lines.append("")
+    return "\n".join(lines) if lines else "No settings have been indexed yet.\n"
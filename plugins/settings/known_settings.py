@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import collections
+import copy
+import functools
 import logging
 import os
 import re
-import textwrap
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import ClassVar
 from weakref import WeakValueDictionary
 
 import sublime
 from sublime_lib import ResourcePath, encodings
 
-from ..lib import get_setting
+from ..lib import get_setting, resource_catalog
 from ..lib.weakmethod import WeakMethodProxy
+from .index_cache import SettingsIndexCache, content_stamp, resource_stamp
+from .index_stats import IndexStats, ResourceStats, estimate_size
 from .region_math import VALUE_SCOPE, get_last_key_name_from, get_value_region_at
+from .tokenizer import LazyValues, parse_settings
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,25 @@ PREF_FILE_ALIAS = "Base File.sublime-settings"
 
 KIND_SETTING = (sublime.KIND_ID_VARIABLE, "S", "Setting")
 
+IGNORED_PATTERNS = frozenset(("/User/", "/Preferences Editor/"))
+
+# maximum number of rendered tooltips to keep per settings file
+TOOLTIP_CACHE_SIZE = 128
+# maximum length of raw default values to keep decoded
+DECODED_CACHE_LIMIT = 1024
+# delay in ms before writing the index cache after a single base file was re-indexed
+INDEX_CACHE_SAVE_DELAY = 2000
+
+# parsed defaults and comments of a single base file
+SettingsLayer = collections.namedtuple('SettingsLayer', ['defaults', 'comments'])
+# merged settings keys mapped to the layer defining them and merged comments
+SettingsSnapshot = collections.namedtuple('SettingsSnapshot', ['owners', 'comments'])
+
+# keys whose value completions are built from resources instead of their comment
+COLOR_SCHEME_KEYS = frozenset(('color_scheme', 'dark_color_scheme', 'light_color_scheme'))
+ENCODING_KEYS = frozenset(('default_encoding', 'fallback_encoding'))
+THEME_KEYS = frozenset(('theme', 'dark_theme', 'light_theme'))
+
 
 def html_encode(string):
     """Encode some critical characters to html entities."""
@@ -80,6 +106,67 @@ def decode_value(string):
         return float(string)
 
 
+@functools.lru_cache(maxsize=4096)
+def _values_from_comment(comment):
+    """Extract the possible / allowed values of a setting from its comment.
+
+    Many settings are commented with a list of quoted words representing
+    the possible / allowed values.
+    Comments are often shared between settings files,
+    so results are cached by the comment text.
+
+    Returns:
+        tuple: The decoded values in order of appearance.
+    """
+    values = []
+    for match in re.finditer(r"`([^`\n]+)`", comment):
+        # backticks should wrap the value in JSON representation,
+        # so we try to decode it
+        value = match.group(1)
+        try:
+            value = sublime.decode_value(value)
+        except ValueError:
+            pass
+        if isinstance(value, list):
+            # Suggest list items as completions instead of a string
+            # representation of the list.
+            # Unless it's a dict.
+            values.extend(v for v in value if not isinstance(v, dict))
+        elif isinstance(value, dict):
+            # TODO what should we do with dicts?
+            pass
+        else:
+            values.append(value)
+
+    for match in re.finditer(r'"([\.\w]+)"', comment):
+        # quotation marks either wrap a string, a numeric or a boolean
+        # fall back to a str
+        (value,) = match.groups()
+        try:
+            value = decode_value(value)
+        except ValueError:
+            pass
+        values.append(value)
+    return tuple(values)
+
+
+def _intern_strings(mapping):
+    """Return a copy of a flat mapping of strings with keys and values interned."""
+    intern = sys.intern
+    return {intern(key): intern(value) for key, value in mapping.items()}
+
+
+def _leaf_maps(chain_map):
+    """Return the maps of a ChainMap in lookup order, expanding nested ChainMaps."""
+    maps = []
+    for mapping in chain_map.maps:
+        if isinstance(mapping, collections.ChainMap):
+            maps.extend(_leaf_maps(mapping))
+        else:
+            maps.append(mapping)
+    return maps
+
+
 class KnownSettings:
     """A class which provides all known settings with comments/defaults.
 
@@ -92,8 +179,10 @@ class KnownSettings:
     # and using weakrefs for easy garbage collection
     cache: ClassVar[WeakValueDictionary[str, KnownSettings]] = WeakValueDictionary()
 
-    on_loaded_callbacks: list[WeakMethodProxy]
-    on_loaded_once_callbacks: list[WeakMethodProxy]
+    # ordered sets of callbacks, protected by `_callbacks_lock`
+    on_loaded_callbacks: dict[WeakMethodProxy, None]
+    on_loaded_once_callbacks: dict[WeakMethodProxy, None]
+    layers: dict[str, SettingsLayer]
     defaults: collections.ChainMap[str, object]
     comments: collections.ChainMap[str, str]
     fallback_settings: KnownSettings | None = None
@@ -121,9 +210,21 @@ class KnownSettings:
         # the associated settings file name all the settings belong to
         self.filename = filename
         self._is_loaded = False
-        # callback lists
-        self.on_loaded_callbacks = []
-        self.on_loaded_once_callbacks = []
+        # callback registries
+        self._callbacks_lock = threading.Lock()
+        self.on_loaded_callbacks = {}
+        self.on_loaded_once_callbacks = {}
+        # the parsed base files, keyed by resource path in precedence order
+        self.layers = {}
+        self._generation = 0
+        # data derived from the merged view, such as completions
+        self._derived_data = {}
+        self._derived_generation = None
+        # timings and sizes of the most recent (re-)load
+        self.stats = IndexStats(filename)
+        # the index cache of the most recent load, re-used when a single file is re-indexed
+        self._index_cache = None
+        self._index_cache_save_request = 0
         # the dictionary with all defaults of a setting
         self.defaults = collections.ChainMap()
         # the dictionary with all comments of each setting
@@ -145,101 +246,311 @@ class KnownSettings:
         # Due to us archiving the callback, we use a weakref
         # to avoid a circular reference to all SettingListeners affected,
         # ensuring our __del__ is properly called when all relevant views are closed.
-        if self._is_loaded:
-            # Invoke callback 'immediately' since we're already loaded.
-            # Note that this is currently not thread-safe.
-            sublime.set_timeout_async(on_loaded, 0)
-
-        if not once:
-            if callbacks := self.on_loaded_callbacks:
-                callbacks.append(WeakMethodProxy(on_loaded))
-        elif not self._is_loaded:
-            if callbacks := self.on_loaded_once_callbacks:
-                callbacks.append(WeakMethodProxy(on_loaded))
+        # Adding the same bound method again has no effect.
+        callback = WeakMethodProxy(on_loaded)
+        with self._callbacks_lock:
+            if self._is_loaded:
+                # Invoke callback 'immediately' since we're already loaded.
+                sublime.set_timeout_async(on_loaded, 0)
+            if not once:
+                self.on_loaded_callbacks[callback] = None
+            elif not self._is_loaded:
+                self.on_loaded_once_callbacks[callback] = None
 
     def __del__(self):
         logger.debug("deleting KnownSettings instance for %r", self.filename)
 
     def __iter__(self):
         """Iterate over default keys."""
-        return iter(self.defaults)
+        return iter(self._snapshot().owners)
+
+    def __contains__(self, key):
+        return key in self._snapshot().owners
+
+    def keys(self):
+        """Return a set-like view of all known keys."""
+        return self._snapshot().owners.keys()
+
+    def get_default(self, key, default=None):
+        """Return the default value of a settings key."""
+        owner = self._snapshot().owners.get(key)
+        return default if owner is None else owner[key]
+
+    def get_comment(self, key):
+        """Return the comment of a settings key or None."""
+        return self._snapshot().comments.get(key)
 
     def trigger_settings_reload(self):
         # look for settings files asynchronously
         sublime.set_timeout_async(self._load_settings, 0)
 
-    def _load_settings(self):
-        """Load and merge settings and their comments from all base files.
+    def trigger_file_reload(self, file_path):
+        """Re-index a single base file after it has been modified.
 
-        The idea is each package which wants to add a valid entry to the
-        `Preferences.sublime-settings` file must provide such a file with all
-        keys it wants to add. These keys and the associated comments above it
-        are loaded into dictionaries and used to provide tooltips, completions
-        and linting.
+        Arguments:
+            file_path (str):
+                The path of the modified file.
         """
-        ignored_patterns = frozenset(("/User/", "/Preferences Editor/"))
+        sublime.set_timeout_async(lambda: self._reload_file(file_path), 0)
 
+    def _find_resources(self):
+        start_time = time.perf_counter()
         # TODO project settings include "Preferences",
         # but we don't have a syntax def for those yet
-        logger.debug("loading defaults and comments for %r", self.filename)
-        start_time = time.time()
         resources = sublime.find_resources(self.filename)
         resources += sublime.find_resources(self.filename + "-hints")
         if self.filename == PREF_FILE:
             resources += sublime.find_resources(PREF_FILE_ALIAS)
         logger.debug("found %d %r files", len(resources), self.filename)
+        resources = [
+            resource
+            for resource in resources
+            if not any(ignored in resource for ignored in IGNORED_PATTERNS)
+        ]
+        self.stats.find_time = time.perf_counter() - start_time
+        return resources
+
+    def _is_base_resource(self, resource):
+        """Check whether a resource would be indexed by this instance."""
+        names = {self.filename, self.filename + "-hints"}
+        if self.filename == PREF_FILE:
+            names.add(PREF_FILE_ALIAS)
+        return (
+            resource.rpartition("/")[2] in names
+            and not any(ignored in resource for ignored in IGNORED_PATTERNS)
+        )
 
-        for resource in resources:
-            if any(ignored in resource for ignored in ignored_patterns):
-                logger.debug("ignoring %r", resource)
-                continue
+    def _index_resource(self, resource, index_cache):
+        """Return the defaults and comments of a single resource or None on failure.
 
-            try:
+        Timings and sizes are recorded in `self.stats`.
+        """
+        stats = ResourceStats(resource)
+        self.stats.add(stats)
+        try:
+            start_time = time.perf_counter()
+            content = None
+            stamp = resource_stamp(resource)
+            if stamp is None:
+                content = sublime.load_resource(resource)
+                stamp = content_stamp(content)
+
+            cached = index_cache.get(resource, stamp)
+            stats.cached = bool(cached)
+            if cached:
+                logger.debug("using cached index for %r", resource)
+                raw_values, comments = cached
+                stats.load_time = time.perf_counter() - start_time
+            else:
                 logger.debug("parsing %r", resource)
-                lines = sublime.load_resource(resource).splitlines()
-                for key, value in self._parse_settings(lines).items():
-                    # merge settings without overwriting existing ones
-                    self.defaults.setdefault(key, value)
-            except Exception as e:
-                logger.error("error parsing %r - %s%r", resource, e.__class__.__name__, e.args)
+                if content is None:
+                    content = sublime.load_resource(resource)
+                parse_start_time = time.perf_counter()
+                stats.load_time = parse_start_time - start_time
+                raw_values, comments = parse_settings(content)
+                stats.parse_time = time.perf_counter() - parse_start_time
+                index_cache.put(resource, stamp, raw_values, comments)
+
+            # keys, comments and short values repeat across base files
+            # and the instances of other settings files
+            raw_values = _intern_strings(raw_values)
+            comments = _intern_strings(comments)
+            stats.num_keys = len(raw_values)
+            stats.num_comments = len(comments)
+            stats.values_size = estimate_size(raw_values)
+            stats.comments_size = estimate_size(comments)
+            defaults = LazyValues(raw_values, sublime.decode_value, DECODED_CACHE_LIMIT)
+            return SettingsLayer(defaults, comments)
+        except Exception as e:
+            logger.error("error parsing %r - %s%r", resource, e.__class__.__name__, e.args)
+            stats.error = e.__class__.__name__
+            return None
+
+    def _load_settings(self):
+        """Load and merge settings and their comments from all base files.
+
+        The idea is each package which wants to add a valid entry to the
+        `Preferences.sublime-settings` file must provide such a file with all
+        keys it wants to add. These keys and the associated comments above it
+        are loaded into dictionaries and used to provide tooltips, completions
+        and linting.
+        """
+        logger.debug("loading defaults and comments for %r", self.filename)
+        self.stats.reset()
+        start_time = time.time()
+
+        index_cache = self._index_cache = SettingsIndexCache.load(self.filename)
+        # a pending save of the previous cache would overwrite this one
+        self._index_cache_save_request += 1
+        resources = self._find_resources()
+        index_start_time = time.perf_counter()
+
+        def index_resource(resource):
+            return self._index_resource(resource, index_cache)
+
+        # Overlap reading resources with parsing others.
+        # Results are merged in resource order to retain precedence.
+        workers = get_setting('settings.index_threads', 4)
+        if isinstance(workers, int) and workers > 1 and len(resources) > 1:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="PackageDev-settings-index"
+            ) as executor:
+                results = list(executor.map(index_resource, resources))
+        else:
+            results = list(map(index_resource, resources))
+
+        layers = {resource: layer for resource, layer in zip(resources, results) if layer}
+        index_cache.save(prune=True)
+        self.stats.index_time = time.perf_counter() - index_start_time
 
         duration = time.time() - start_time
         logger.debug("loading took %.3fs", duration)
 
         # include general settings if we're in a syntax-specific file
         is_syntax_specific = self._is_syntax_specific()
+        # the fallback whose loading we need to wait for, if any
+        fallback = None
         if is_syntax_specific and not self.fallback_settings:
-            self.fallback_settings = KnownSettings(PREF_FILE)
-            # add fallbacks to the ChainMaps
-            self.defaults.maps.append(self.fallback_settings.defaults)
-            self.comments.maps.append(self.fallback_settings.comments)
+            fallback = self.fallback_settings = KnownSettings.load(PREF_FILE)
+        elif self.fallback_settings and not is_syntax_specific:
+            # file was renamed, probably
+            self.fallback_settings = None
+
+        self.layers = layers
+        merge_start_time = time.perf_counter()
+        self._update_maps()
+        self._snapshot()
+        self.stats.merge_time = time.perf_counter() - merge_start_time
+
+        if fallback is not None:
             # these may be loaded later, so delay calling our own callbacks
-            self.fallback_settings.add_on_loaded(self._has_loaded, once=True)
+            fallback.add_on_loaded(self._has_loaded, once=True)
         else:
-            if self.fallback_settings and not is_syntax_specific:
-                # file was renamed, probably
-                self.fallback_settings = None
-                self.defaults.maps.pop()
-                self.comments.maps.pop()
             self._has_loaded()
 
+    def _reload_file(self, file_path):
+        """Re-index a single modified base file and patch it into the merged view."""
+        try:
+            resource = str(ResourcePath.from_file_path(file_path))
+        except ValueError:
+            logger.debug("not a resource: %r", file_path)
+            return
+        if not self._is_base_resource(resource):
+            logger.debug("not indexed by %r: %r", self.filename, resource)
+            return
+        if resource not in self.layers:
+            # a new base file, so its position among the others is unknown
+            self._load_settings()
+            return
+
+        start_time = time.time()
+        index_cache = self._index_cache or SettingsIndexCache.load(self.filename)
+        self._index_cache = index_cache
+        index_start_time = time.perf_counter()
+        layer = self._index_resource(resource, index_cache)
+        self._schedule_index_cache_save()
+        self.stats.index_time = time.perf_counter() - index_start_time
+        self.layers[resource] = layer or SettingsLayer({}, {})
+        merge_start_time = time.perf_counter()
+        self._update_maps()
+        self._snapshot()
+        self.stats.merge_time = time.perf_counter() - merge_start_time
+        logger.debug("re-indexing %r took %.3fs", resource, time.time() - start_time)
+
+        self._has_loaded()
+
+    def _schedule_index_cache_save(self):
+        """Write the index cache after a delay, once for several re-indexed files."""
+        self._index_cache_save_request += 1
+        request = self._index_cache_save_request
+        sublime.set_timeout_async(lambda: self._save_index_cache(request), INDEX_CACHE_SAVE_DELAY)
+
+    def _save_index_cache(self, request):
+        if request == self._index_cache_save_request and self._index_cache:
+            self._index_cache.save()
+
+    def _update_maps(self):
+        """Rebuild the maps of the ChainMaps from the layers in resource order.
+
+        The ChainMap objects themselves are kept
+        because syntax-specific instances chain them as their fallback.
+        """
+        defaults_maps = [layer.defaults for layer in self.layers.values()]
+        comments_maps = [layer.comments for layer in self.layers.values()]
+        if self.fallback_settings:
+            defaults_maps.append(self.fallback_settings.defaults)
+            comments_maps.append(self.fallback_settings.comments)
+        self.defaults.maps[:] = defaults_maps or [{}]
+        self.comments.maps[:] = comments_maps or [{}]
+        self._generation += 1
+
+    def _snapshot(self):
+        """Return a flattened, read-only view of the defaults and comments.
+
+        Lookups in the snapshot need a single hash probe
+        instead of walking the maps of the ChainMaps.
+        Values are still fetched from (and lazily decoded by) their layer.
+        """
+        derived = self._derived()
+        snapshot = derived.get('snapshot')
+        if snapshot is None:
+            owners = {}
+            for mapping in reversed(_leaf_maps(self.defaults)):
+                owners.update(dict.fromkeys(mapping, mapping))
+            comments = {}
+            for mapping in reversed(_leaf_maps(self.comments)):
+                comments.update(mapping)
+            snapshot = derived['snapshot'] = SettingsSnapshot(owners, comments)
+        return snapshot
+
+    @property
+    def generation(self):
+        """A value that changes whenever the merged view or one of its fallbacks changes."""
+        if self.fallback_settings:
+            return (self._generation, self.fallback_settings.generation)
+        return (self._generation,)
+
+    def _derived(self):
+        """Return the storage for data derived from the merged view.
+
+        It is reset whenever the merged view changed.
+        """
+        generation = self.generation
+        if self._derived_generation != generation:
+            self._derived_data = {}
+            self._derived_generation = generation
+        return self._derived_data
+
     def _has_loaded(self):
-        self._is_loaded = True
+        # build the snapshot before any callback needs it;
+        # value completions are built per key on first request
+        self._snapshot()
+
+        with self._callbacks_lock:
+            self._is_loaded = True
+            once_callbacks = list(self.on_loaded_once_callbacks)
+            self.on_loaded_once_callbacks.clear()
+            callbacks = list(self.on_loaded_callbacks)
 
-        for callback in self.on_loaded_once_callbacks:
+        for callback in once_callbacks:
             try:
                 callback()
             except ReferenceError:
                 pass
-        self.on_loaded_once_callbacks.clear()
 
-        # copy callback list so we can clean up expired references
-        for callback in tuple(self.on_loaded_callbacks):
+        # callbacks are called without holding the lock,
+        # so expired references are collected and removed afterwards
+        dead = []
+        for callback in callbacks:
             try:
                 callback()
             except ReferenceError:
-                logger.debug("removing gone-away weak on_loaded_callback reference")
-                self.on_loaded_callbacks.remove(callback)
+                dead.append(callback)
+        if dead:
+            logger.debug("removing %d gone-away weak on_loaded_callback references", len(dead))
+            with self._callbacks_lock:
+                for callback in dead:
+                    self.on_loaded_callbacks.pop(callback, None)
 
     def _is_syntax_specific(self):
         """Check whether a syntax def with the same base file name exists.
@@ -247,76 +558,13 @@ class KnownSettings:
         Returns:
             bool
         """
-        syntax_file_exts = (".sublime-syntax", ".tmLanguage")
         name_no_ext = os.path.splitext(self.filename)[0]
-        for ext in syntax_file_exts:
-            syntax_file_name = name_no_ext + ext
-            resources = sublime.find_resources(syntax_file_name)
-            if resources:
-                logger.debug("syntax-specific settings file for %r", resources[0])
-                return True
+        syntax_path = resource_catalog.syntax_index().get(name_no_ext)
+        if syntax_path:
+            logger.debug("syntax-specific settings file for %r", syntax_path)
+            return True
         return False
 
-    def _parse_settings(self, lines):
-        """Parse the setting file and capture comments.
-
-        This is naive but gets the job done most of the time.
-        """
-        content = []
-        comment = []
-        in_comment = False
-
-        for line in lines:
-            stripped = line.strip()
-
-            if in_comment:
-                if stripped.endswith("*/"):
-                    in_comment = False
-                    # remove all spaces and asterix
-                    line = line.rstrip("*/ \t")
-                    if line:
-                        comment.append(line)
-                elif stripped.startswith("* "):
-                    comment.append(stripped[2:])
-                else:
-                    comment.append(line)
-                continue
-            # ignore empty lines if not in a comment
-            # empty line in comment may be used as visual separator
-            elif not stripped:
-                continue
-
-            if stripped.startswith("/*"):
-                in_comment = True
-                # remove all asterix
-                stripped = stripped[2:].lstrip("*")
-                if stripped:
-                    comment.append(stripped)
-                continue
-
-            if stripped.startswith("//"):
-                # skip comment lines ending with `//` (likely used as separators)
-                # a standalone `//` adds an empty line as visual separator
-                stripped = stripped[2:]
-                if not stripped or not stripped.endswith("//"):
-                    comment.append(stripped)
-                continue
-
-            content.append(line)
-            if comment:
-                # the json key is used as key for the comments located above it
-                match = re.match(r'"((?:[^"]|\\.)*)":', stripped)
-                if not match:
-                    continue
-                key = match.group(1)
-
-                if key not in self.comments:
-                    self.comments[key] = textwrap.dedent('\n'.join(comment))
-                comment.clear()
-
-        # Return decoded json file from content with stripped comments
-        return sublime.decode_value('\n'.join(content))
-
     def build_tooltip(self, view, key):
         """Return html encoded docstring for settings key.
 
@@ -326,15 +574,29 @@ class KnownSettings:
             key (string):
                 the key under the cursor
         """
-        if key in self.defaults:
+        # rendered tooltips are kept in a bounded LRU cache
+        # that is dropped along with all other derived data
+        tooltips = self._derived().setdefault('tooltips', collections.OrderedDict())
+        try:
+            body = tooltips[key]
+        except KeyError:
+            pass
+        else:
+            tooltips.move_to_end(key)
+            return body
+
+        if key in self:
             # the comment for the setting
-            comment = html_encode(self.comments.get(key) or "No description.")
+            comment = html_encode(self.get_comment(key) or "No description.")
             # the default value from base file
-            default = html_encode(sublime.encode_value(self.defaults.get(key), pretty=True))
+            default = html_encode(sublime.encode_value(self.get_default(key), pretty=True))
         else:
             comment, default = "No description.", "unknown setting"
         # format tooltip html content
-        return f"<h1>{key}</h1><h2>Default: {default}</h2><p>{comment}</p>"
+        body = tooltips[key] = f"<h1>{key}</h1><h2>Default: {default}</h2><p>{comment}</p>"
+        if len(tooltips) > TOOLTIP_CACHE_SIZE:
+            tooltips.popitem(last=False)
+        return body
 
     def insert_snippet(self, view, key):
         """Insert a snippet for the settings key at the end of the view.
@@ -379,7 +641,7 @@ class KnownSettings:
                 bol, eol = ",\n", ""
 
         # format and insert the snippet
-        snippet = self._key_snippet(key, self.defaults[key], bol, eol)
+        snippet = self._key_snippet(key, self.get_default(key), bol, eol)
         view.sel().clear()
         view.sel().add(point)
         view.run_command('insert_snippet', {'contents': snippet})
@@ -401,6 +663,31 @@ class KnownSettings:
         """
         if view.match_selector(point - 1, "string"):
             # we are within quotations, return words only
+            eol = None
+        else:
+            line = view.substr(view.line(point)).strip()
+            # don't add newline after snippet if user starts on empty line
+            eol = "," if len(line) == len(prefix) else ",\n"
+
+        return self._key_completion_table(eol)
+
+    def _key_completion_table(self, eol):
+        """Return the completions of all known keys, built once per index update.
+
+        Arguments:
+            eol (string or None):
+                The suffix of key snippets
+                or `None` for plain key names to complete within quotations.
+
+        Returns:
+            list of sublime.CompletionItem sorted by key
+        """
+        tables = self._derived().setdefault('key_completions', {})
+        if eol in tables:
+            return tables[eol]
+
+        keys = sorted(self)
+        if eol is None:
             completions = [
                 sublime.CompletionItem(
                     trigger=key,
@@ -409,25 +696,23 @@ class KnownSettings:
                     # TODO link to show full description
                     # details=,
                 )
-                for key in self.defaults
+                for key in keys
             ]
         else:
-            line = view.substr(view.line(point)).strip()
-            # don't add newline after snippet if user starts on empty line
-            eol = "," if len(line) == len(prefix) else ",\n"
             # no quotations -> return full snippet
             completions = [
                 sublime.CompletionItem(
                     trigger=key,
-                    completion=self._key_snippet(key, value, eol=eol),
+                    completion=self._key_snippet(key, self.get_default(key), eol=eol),
                     completion_format=sublime.COMPLETION_FORMAT_SNIPPET,
                     kind=KIND_SETTING,
                     # TODO link to show full description
                     # details=,
                 )
-                for key, value in self.defaults.items()
+                for key in keys
             ]
-
+        logger.debug("built %d key completions for %r", len(completions), self.filename)
+        tables[eol] = completions
         return completions
 
     @staticmethod
@@ -515,9 +800,7 @@ class KnownSettings:
             logger.debug("unable to find current key")
             return None
 
-        # Use a map to deduplicate completions by trigger; latter overrides
-        completions_map = {c.trigger: c for c in self._value_completions_for(key)}
-        completions = list(completions_map.values())
+        completions = self._value_completions_for(key)
         if not completions:
             logger.debug("no completions to offer")
             return None
@@ -536,7 +819,7 @@ class KnownSettings:
         in_str = view.match_selector(point, "string")
         logger.debug("completing a string (%s) within a string (%s)", is_str, in_str)
 
-        is_list = isinstance(self.defaults.get(key), list)
+        is_list = self._default_is_list(key)
         in_list = view.match_selector(point, "meta.sequence")
         logger.debug("completing a list item (%s) within a list (%s)", is_list, in_list)
 
@@ -557,6 +840,7 @@ class KnownSettings:
             # the value typed so far, which may differ from prefix for floats
             typed_region = sublime.Region(value_region.begin(), point)
             typed = view.substr(typed_region).lstrip()
+            jsonified = []
             for c in completions:
                 value = c.completion
                 # unroll dicts
@@ -583,7 +867,11 @@ class KnownSettings:
 
                 # escape snippet markers
                 value_str = value_str.replace("$", "\\$")
+                # completion items may be shared, so don't modify them
+                c = copy.copy(c)
                 c.completion = value_str
+                jsonified.append(c)
+            completions = jsonified
 
         # disable word completion to prevent stupid suggestions
         return completions
@@ -591,80 +879,62 @@ class KnownSettings:
     def _value_completions_for(self, key):
         """Collect and return value completions from matching source.
 
+        Completion items must not be modified
+        as they may be shared between requests.
+
         Arguments:
             key (string):
                 the settings key name to read comments from
 
         Returns:
-            {(trigger, contents), ...}
-                A set of all completions.
+            [sublime.CompletionItem]
+                A list of completions, deduplicated by trigger.
         """
-        logger.debug("building completions for key %r", key)
-        default = self.defaults.get(key)
-        logger.debug("default value: %r", default)
-
-        if key in ('color_scheme', 'dark_color_scheme', 'light_color_scheme'):
-            yield from self._color_scheme_completions(key, default)
-        elif key in ('default_encoding', 'fallback_encoding'):
-            yield from self._encoding_completions(default)
-        elif key in ('theme', 'dark_theme', 'light_theme'):
-            yield from self._theme_completions(key, default)
+        if key in COLOR_SCHEME_KEYS:
+            completions = self._color_scheme_completions(key, self.get_default(key))
+        elif key in ENCODING_KEYS:
+            completions = self._encoding_completions(self.get_default(key))
+        elif key in THEME_KEYS:
+            completions = self._theme_completions(key, self.get_default(key))
         else:
-            yield from self._completions_from_comment(key, default)
-            yield from self._completions_from_default(key, default)
-
-    def _completions_from_comment(self, key, default):
-        """Parse settings comments and return all possible values.
+            return self._value_completion_table(key)
 
-        Many settings are commented with a list of quoted words representing
-        the possible / allowed values. This method generates a list of these
-        quoted words which are suggested in auto-completions.
+        # Use a map to deduplicate completions by trigger; latter overrides
+        return list({c.trigger: c for c in completions}.values())
 
-        Arguments:
-            key (string):
-                the settings key name to read comments from
-            default (any):
-                the default value of the setting used to mark completion items
-                as "default".
+    def _value_completion_table(self, key):
+        """Return the completions of a key's comment and default value.
 
-        Returns:
-            {(trigger, contents), ...}
-                A set of all completions.
+        They are built on first request and stored until the merged view changes.
         """
-        comment = self.comments.get(key)
-        if not comment:
-            return
+        tables = self._derived().setdefault('value_completions', {})
+        completions = tables.get(key)
+        if completions is None:
+            logger.debug("building completions for key %r", key)
+            default = self.get_default(key)
+            logger.debug("default value: %r", default)
+            self._derived().setdefault('default_is_list', {})[key] = isinstance(default, list)
+            comment = self.get_comment(key)
+            items = [
+                format_completion_item(value, default)
+                for value in (_values_from_comment(comment) if comment else ())
+            ]
+            items.extend(self._completions_from_default(key, default))
+            # Use a map to deduplicate completions by trigger; latter overrides
+            completions = tables[key] = list({c.trigger: c for c in items}.values())
+        return completions
 
-        for match in re.finditer(r"`([^`\n]+)`", comment):
-            # backticks should wrap the value in JSON representation,
-            # so we try to decode it
-            value = match.group(1)
-            try:
-                value = sublime.decode_value(value)
-            except ValueError:
-                pass
-            if isinstance(value, list):
-                # Suggest list items as completions instead of a string
-                # representation of the list.
-                # Unless it's a dict.
-                for v in value:
-                    if not isinstance(v, dict):
-                        yield format_completion_item(v, default)
-            elif isinstance(value, dict):
-                # TODO what should we do with dicts?
-                pass
-            else:
-                yield format_completion_item(value, default)
+    def _default_is_list(self, key):
+        """Return whether the default value of a key is a list.
 
-        for match in re.finditer(r'"([\.\w]+)"', comment):
-            # quotation marks either wrap a string, a numeric or a boolean
-            # fall back to a str
-            (value,) = match.groups()
-            try:
-                value = decode_value(value)
-            except ValueError:
-                pass
-            yield format_completion_item(value, default)
+        The result is stored until the merged view changes,
+        as large default values are decoded on every access.
+        """
+        flags = self._derived().setdefault('default_is_list', {})
+        is_list = flags.get(key)
+        if is_list is None:
+            is_list = flags[key] = isinstance(self.get_default(key), list)
+        return is_list
 
     @staticmethod
     def _completions_from_default(key, default):
@@ -685,7 +955,8 @@ class KnownSettings:
                 yield format_completion_item(value, default=default)
         elif isinstance(default, list):
             for value in default:
-                yield format_completion_item(value, is_default=True)
+                if not isinstance(value, dict):  # TODO can't complete these yet
+                    yield format_completion_item(value, is_default=True)
         elif isinstance(default, dict):
             return  # TODO can't complete these yet
         else:
@@ -711,7 +982,7 @@ class KnownSettings:
             yield format_completion_item(value="auto", annotation="dark-/light switching")
 
         hidden = get_setting('settings.exclude_color_scheme_patterns') or []
-        for scheme_path in sublime.find_resources("*.sublime-color-scheme"):
+        for scheme_path in resource_catalog.find_resources("*.sublime-color-scheme"):
             if not any(hide in scheme_path for hide in hidden):
                 try:
                     root, package, *_, name = scheme_path.split("/")
@@ -721,7 +992,7 @@ class KnownSettings:
                     continue
                 yield format_completion_item(value=name, default=default, annotation=package)
 
-        for scheme_path in sublime.find_resources("*.tmTheme"):
+        for scheme_path in resource_catalog.find_resources("*.tmTheme"):
             if not any(hide in scheme_path for hide in hidden):
                 try:
                     root, package, *_, name = scheme_path.split("/")
@@ -768,8 +1039,7 @@ class KnownSettings:
         hidden = get_setting('settings.exclude_theme_patterns') or []
         if key == 'theme':
             yield format_completion_item(value="auto", annotation="dark-/light switching")
-        for theme_path in ResourcePath.glob_resources("*.sublime-theme"):
-            if not any(hide in theme_path.name for hide in hidden):
-                yield format_completion_item(
-                    value=theme_path.name, default=default, annotation="theme"
-                )
+        for theme_path in resource_catalog.find_resources("*.sublime-theme"):
+            name = theme_path.rpartition("/")[2]
+            if not any(hide in name for hide in hidden):
+                yield format_completion_item(value=name, default=default, annotation="theme")
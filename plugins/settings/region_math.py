@@ -1,3 +1,5 @@
+from ..lib.region_index import region_index
+
 # match top-level keys only
 KEY_SCOPE = "entity.name.other.key.sublime-settings"
 KEY_COMPLETIONS_SCOPE = (
@@ -13,9 +15,7 @@ VALUE_SCOPE = (
 def get_key_region_at(view, point):
     """Return the key region if point is on a settings key or None."""
     if view.match_selector(point, KEY_SCOPE):
-        for region in view.find_by_selector(KEY_SCOPE):
-            if region.contains(point):
-                return region
+        return region_index(view, KEY_SCOPE).at(point)
     return None
 
 
@@ -27,15 +27,7 @@ def get_key_name(view, point):
 
 def get_last_key_region(view, point):
     """Return the last key region preceding the specified point or None."""
-    last_region = None
-    regions = view.find_by_selector(KEY_SCOPE)
-    if not regions:
-        return None
-    for region in regions:
-        if region.begin() > point:
-            break
-        last_region = region
-    return last_region
+    return region_index(view, KEY_SCOPE).last_starting_at_or_before(point)
 
 
 def get_last_key_name_from(view, point):
@@ -50,7 +42,5 @@ def get_last_key_name_from(view, point):
 def get_value_region_at(view, point):
     """Return the value region if point is on a settings value or None."""
     if view.match_selector(point, VALUE_SCOPE):
-        for region in view.find_by_selector(VALUE_SCOPE):
-            if region.contains(point):
-                return region
+        return region_index(view, VALUE_SCOPE).at(point)
     return None
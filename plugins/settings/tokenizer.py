@@ -0,0 +1,239 @@
+"""Single-pass tokenizer for sublime-settings files.
+
+Only the top-level object is tokenized.
+Values are kept as raw JSON text
+and decoded on first access by `LazyValues`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from collections.abc import Callable, Iterator
+from typing import Mapping
+
+__all__ = ('LazyValues', 'parse_settings')
+
+logger = logging.getLogger(__name__)
+
+# A token on the level of the root object, preceded by whitespace.
+# Consecutive line comments form a single token.
+# Scalar values and flat arrays or objects are matched along with their key
+# and the following comma,
+# while other nested values are skipped using `_NESTED_TOKEN_RE`.
+_ROOT_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s*)
+    (?:
+        (?P<line>//[^\n]*(?:\n[ \t]*//[^\n]*)*)
+      | (?P<block>/\*.*?(?:\*/|\Z))
+      | "(?P<key>[^"\\]*(?:\\.[^"\\]*)*)"\s*:\s*
+        (?:
+          (?P<scalar>
+            "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+          | [^\s"/,:\[\]{}]+
+          | \[[^"/\[\]{}]*(?:"[^"\\\n]*(?:\\.[^"\\\n]*)*"[^"/\[\]{}]*)*\]
+          | \{[^"/\[\]{}]*(?:"[^"\\\n]*(?:\\.[^"\\\n]*)*"[^"/\[\]{}]*)*\}
+          )
+          \s*(?:,|(?=}|//|/\*))
+        )?
+      | (?P<comma>,)
+      | (?P<begin>{)
+      | (?P<end>})
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_NESTED_TOKEN_RE = re.compile(
+    r"""
+    "[^"\\]*(?:\\.[^"\\]*)*"
+    | //[^\n]*
+    | /\*.*?(?:\*/|\Z)
+    | [\[{]
+    | [\]},]
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def _skip_value(text, pos):
+    """Return the end of the (nested) value starting at `pos`."""
+    depth = 0
+    for match in _NESTED_TOKEN_RE.finditer(text, pos):
+        char = match.group()
+        if char in "[{":
+            depth += 1
+        elif char in "]}":
+            if depth == 0:
+                return match.start()
+            depth -= 1
+        elif char == "," and depth == 0:
+            return match.start()
+    return len(text)
+
+
+def _block_comment_lines(token):
+    """Split a block comment into lines, stripping the comment markers."""
+    lines = token.splitlines()
+    if len(lines) == 1:
+        stripped = token[2:].rstrip("/").strip("* \t")
+        return [stripped] if stripped else []
+
+    result = []
+    first = lines[0][2:].lstrip("*").rstrip()
+    if first:
+        result.append(first)
+    for line in lines[1:-1]:
+        stripped = line.strip()
+        # remove leading asterisk of aligned comments
+        result.append(stripped[2:] if stripped.startswith("* ") else line)
+    last = lines[-1].rstrip("*/ \t")
+    if last:
+        result.append(last)
+    return result
+
+
+def _dedent(lines):
+    """Join lines and remove their common leading whitespace.
+
+    Equivalent to `textwrap.dedent`, but operating on a list of lines.
+    """
+    margin = None
+    for line in lines:
+        content = line.lstrip(" \t")
+        if not content:
+            continue
+        indent = line[: len(line) - len(content)]
+        if margin is None:
+            margin = indent
+        elif not indent.startswith(margin):
+            margin = os.path.commonprefix((margin, indent))
+    cut = len(margin or "")
+    return "\n".join(line[cut:] if line.strip(" \t") else "" for line in lines)
+
+
+def parse_settings(text: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Tokenize a settings file in a single pass.
+
+    Comments on their own lines preceding a top-level key
+    are used as that key's comment.
+    Comments within values are ignored.
+
+    Returns:
+        (dict, dict):
+            The raw JSON text of each top-level value
+            and the comments of each key.
+    """
+    values: dict[str, str] = {}
+    comments: dict[str, str] = {}
+    comment: list[str] = []
+    in_root = False
+    pos, size = 0, len(text)
+
+    while pos < size:
+        match = _ROOT_TOKEN_RE.match(text, pos)
+        if not match:
+            if not text[pos:].strip():
+                break
+            # unexpected token, e.g. a root value that is not an object
+            logger.debug("unexpected content at %d", pos)
+            break
+        pos = match.end()
+        kind = match.lastgroup
+
+        if kind in ('line', 'block'):
+            ws_start = match.start()
+            starts_line = "\n" in match.group('ws') or ws_start == 0 or text[ws_start - 1] == "\n"
+            if kind == 'line':
+                lines = match.group('line').split("\n")
+                # a trailing comment of a value, but following lines start a line
+                for line in lines if starts_line else lines[1:]:
+                    line = line.strip()[2:]
+                    # skip comment lines ending with `//` (likely used as separators)
+                    # a standalone `//` adds an empty line as visual separator
+                    if not line or not line.endswith("//"):
+                        comment.append(line)
+            elif starts_line:
+                comment.extend(_block_comment_lines(match.group('block')))
+
+        elif kind in ('key', 'scalar'):
+            if not in_root:
+                break
+            key = match.group('key')
+            if "\\" in key:
+                key = json.loads(f'"{key}"')
+            if comment:
+                # the json key is used as key for the comments located above it
+                if key not in comments:
+                    comments[key] = _dedent(comment)
+                comment.clear()
+
+            raw = match.group('scalar')
+            if raw is None:
+                end = _skip_value(text, pos)
+                raw = text[pos:end].strip()
+                pos = end + 1 if text.startswith(",", end) else end
+            values[key] = raw
+
+        elif kind == 'begin':
+            if in_root:
+                break
+            in_root = True
+
+        elif kind == 'end':
+            break
+
+    return values, comments
+
+
+class LazyValues(Mapping[str, object]):
+    """A read-only mapping decoding the raw JSON text of its values on first access.
+
+    Decoded values are kept unless their raw text is longer than `cache_limit`,
+    in which case they are decoded on every access
+    to avoid holding both representations of large values.
+    Values that fail to decode are logged and reported as `None`.
+    """
+
+    def __init__(
+        self,
+        raw: dict[str, str],
+        decode: Callable[[str], object],
+        cache_limit: int | None = None,
+    ) -> None:
+        self.raw = raw
+        self._decode = decode
+        self._cache_limit = cache_limit
+        self._decoded: dict[str, object] = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+        raw = self.raw[key]
+        try:
+            value = self._decode(raw)
+        except ValueError as e:
+            logger.warning("unable to decode value of %r - %s", key, e)
+            value = None
+        if self._cache_limit is None or len(raw) <= self._cache_limit:
+            self._decoded[key] = value
+        return value
+
+    @property
+    def num_decoded(self):
+        """The number of decoded values currently kept."""
+        return len(self._decoded)
+
+    def __contains__(self, key):
+        return key in self.raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self):
+        return len(self.raw)
@@ -1,18 +1,19 @@
+import fnmatch
+import functools
 import logging
+import os
 import re
 from collections import namedtuple
-from fnmatch import fnmatch
 
 import sublime
 import sublime_plugin
 from sublime_lib.resource_path import ResourcePath
 
-from ..lib import get_setting, inhibit_word_completions, syntax_paths
-from ..lib.scope_data import (
-    COMMIT_SCOPE_COMPLETION_CMD,
-    COMPILED_HEADS,
-    create_scope_suffix_completion,
-)
+from ..lib import get_setting, inhibit_word_completions, resource_catalog, scope_data, syntax_paths
+from ..lib.region_index import region_index
+from ..lib.scope_data import COMMIT_SCOPE_COMPLETION_CMD, create_scope_suffix_completion
+from .inheritance import clear_inherited_symbols
+from .symbols import clear_symbol_tables, symbol_table
 
 __all__ = ('SyntaxDefCompletionsListener', 'PackagedevCommitScopeCompletionCommand')
 
@@ -123,6 +124,82 @@ def format_completions(items, annotation="", kind=sublime.KIND_AMBIGUOUS):
     ]
 
 
+def format_inherited_completions(items, kind=sublime.KIND_AMBIGUOUS):
+    return [
+        sublime.CompletionItem(
+            trigger=trigger,
+            annotation=resource.rpartition("/")[2],
+            kind=kind,
+            details=f"Inherited from {resource}",
+        )
+        for trigger, resource in items
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_excludes(excludes):
+    """Compile fnmatch patterns into a single regex, or None if there are none."""
+    if not excludes:
+        return None
+    # like `fnmatch.fnmatch`, which normalizes the case on case-insensitive platforms
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in excludes), flags)
+
+
+class _SyntaxFileCompletions:
+    """Completions of syntax definition paths, built once per list of syntaxes and excludes.
+
+    Items are grouped by folder, so completing relative paths of siblings is a lookup.
+    """
+
+    kind = (sublime.KIND_ID_VARIABLE, 's', 'Syntax')
+
+    def __init__(self, syntaxes, excludes):
+        self.syntaxes = syntaxes
+        self.excludes = excludes
+        exclude_re = _compile_excludes(excludes)
+        # full resource paths
+        self._items = []
+        # {folder: [items of file names]}
+        self._siblings = {}
+        # {folder: [items]}
+        self._completions = {}
+
+        for syntax in syntaxes:
+            if exclude_re and exclude_re.match(syntax.path):
+                continue
+            annotation = "hidden" if syntax.hidden else ""
+            folder, file = syntax.path.rsplit("/", 1)
+            self._siblings.setdefault(folder, []).append(
+                sublime.CompletionItem(trigger=file, kind=self.kind, annotation=annotation)
+            )
+            self._items.append(
+                sublime.CompletionItem(trigger=syntax.path, kind=self.kind, annotation=annotation)
+            )
+
+    def get(self, folder):
+        """Return the completions for a syntax definition in `folder`.
+
+        The list is shared; do not modify it.
+        """
+        completions = self._completions.get(folder)
+        if completions is None:
+            completions = self._completions[folder] = self._siblings.get(folder, []) + self._items
+        return completions
+
+
+_syntax_file_completions_cache = None
+
+
+def _syntax_file_completions(excludes):
+    global _syntax_file_completions_cache
+    syntaxes = resource_catalog.list_syntaxes()
+    cached = _syntax_file_completions_cache
+    if cached is None or cached.syntaxes is not syntaxes or cached.excludes != excludes:
+        cached = _syntax_file_completions_cache = _SyntaxFileCompletions(syntaxes, excludes)
+    return cached
+
+
 class SyntaxDefCompletionsListener(sublime_plugin.ViewEventListener):
     base_completions_root = format_static_completions(
         [
@@ -285,6 +362,12 @@ class SyntaxDefCompletionsListener(sublime_plugin.ViewEventListener):
 
         return result
 
+    def on_post_save_async(self):
+        # this may be the parent of other syntax definitions,
+        # whose tables include the inherited symbols
+        clear_inherited_symbols()
+        clear_symbol_tables()
+
     def _line_prefix(self, point):
         _, col = self.view.rowcol(point)
         line = self.view.substr(self.view.line(point))
@@ -304,21 +387,10 @@ class SyntaxDefCompletionsListener(sublime_plugin.ViewEventListener):
                 # print("Unexpected prefix mismatch: {} vs {}".format(real_prefix, prefix))
                 return []
 
-        return format_completions(
-            [
-                (self.view.substr(r), self.view.rowcol(r.begin())[0] + 1)
-                for r in self.view.find_by_selector("entity.name.class.context")
-            ],
-            annotation="",
-            kind=TPL_CONTEXT.kind,
-        )
+        return self._complete_symbols('context', TPL_CONTEXT.kind)
 
     def _complete_syntax_file(self):
-        completions = []
-        kind = (sublime.KIND_ID_VARIABLE, 's', 'Syntax')
-
-        settings = sublime.load_settings("PackageDev.sublime-settings")
-        excludes = settings.get("settings.exclude_syntax_patterns", [])
+        excludes = get_setting("settings.exclude_syntax_patterns", [])
         if not isinstance(excludes, list):
             excludes = []
 
@@ -327,30 +399,7 @@ class SyntaxDefCompletionsListener(sublime_plugin.ViewEventListener):
         except (TypeError, ValueError):
             my_folder = ""
 
-        for syntax in sublime.list_syntaxes():
-            if any(fnmatch(syntax.path, pattern) for pattern in excludes):
-                continue
-            # add relative resource path completion (file name of siblings)
-            if my_folder:
-                folder, file = syntax.path.rsplit("/", 1)
-                if folder == my_folder:
-                    completions.append(
-                        sublime.CompletionItem(
-                            trigger=file,
-                            kind=kind,
-                            annotation="hidden" if syntax.hidden else "",
-                        )
-                    )
-            # add full resource path
-            completions.append(
-                sublime.CompletionItem(
-                    trigger=syntax.path,
-                    kind=kind,
-                    annotation="hidden" if syntax.hidden else "",
-                )
-            )
-
-        return completions
+        return _syntax_file_completions(tuple(excludes)).get(my_folder)
 
     def _complete_keyword(self, prefix, locations):
 
@@ -401,11 +450,11 @@ class SyntaxDefCompletionsListener(sublime_plugin.ViewEventListener):
         tokens = real_prefix.split(".")
         if len(tokens) <= 1:
             # No work to be done here, just return the heads
-            return COMPILED_HEADS.to_completion()
+            return scope_data.COMPILED_HEADS.to_completion()
 
         base_scope_completion = self._complete_base_scope(tokens[-1])
         # Browse the nodes and their children
-        nodes = COMPILED_HEADS
+        nodes = scope_data.COMPILED_HEADS
         for i, token in enumerate(tokens[:-1]):
             node = nodes.find(token)
             if not node:
@@ -444,27 +493,22 @@ class SyntaxDefCompletionsListener(sublime_plugin.ViewEventListener):
         return [create_scope_suffix_completion(base_suffix)]
 
     def _complete_variable(self):
-        return format_completions(
-            [
-                (self.view.substr(r), self.view.rowcol(r.begin())[0] + 1)
-                for r in self.view.find_by_selector("entity.name.constant")
-            ],
-            annotation="",
-            kind=TPL_VARIABLE.kind,
-        )
+        return self._complete_symbols('variable', TPL_VARIABLE.kind)
 
     def _complete_branch_point(self):
-        return format_completions(
-            [
-                (self.view.substr(r), self.view.rowcol(r.begin())[0] + 1)
-                for r in self.view.find_by_selector("entity.name.label.branch-point")
-            ],
-            annotation="",
-            kind=TPL_BRANCH.kind,
-        )
+        return self._complete_symbols('branch_point', TPL_BRANCH.kind)
+
+    def _complete_symbols(self, kind, completion_kind):
+        def build(table, kind):
+            local = format_completions(table.symbols(kind), kind=completion_kind)
+            inherited = table.inherited_symbols(kind)
+            return local + format_inherited_completions(inherited, kind=completion_kind)
+
+        # completions are shared until the view is modified, so copy the list
+        return list(symbol_table(self.view).completions(kind, build))
 
     def _determine_version(self):
-        version_regions = self.view.find_by_selector('storage.type.version.sublime-syntax')
+        version_regions = region_index(self.view, 'storage.type.version.sublime-syntax').regions
         if version_regions:
             if len(version_regions) > 1:
                 logger.debug("Found multiple versions (%d), using last", len(version_regions))
@@ -4,6 +4,7 @@ import sublime
 import sublime_plugin
 
 from ..lib import package_settings, syntax_paths
+from ..lib.region_index import region_index
 from ..lib.view_utils import region_flags_from_strings
 
 __all__ = ('SyntaxDefRegexCaptureGroupHighlighter',)
@@ -18,11 +19,35 @@ class SyntaxDefRegexCaptureGroupHighlighter(sublime_plugin.ViewEventListener):
     def is_applicable(cls, settings):
         return settings.get('syntax') == syntax_paths.SYNTAX_DEF
 
-    def on_selection_modified(self):
+    def __init__(self, view):
+        super().__init__(view)
+        # {regexp region: {group number: region}}, valid for `_capture_maps_change_count`
+        self._capture_maps = {}
+        self._capture_maps_change_count = None
+        self._highlight_request = 0
+
+    def on_selection_modified_async(self):
+        # Defer to the end of the queue,
+        # so that only the last of several queued selection changes is processed.
+        self._highlight_request += 1
+        request = self._highlight_request
+        sublime.set_timeout_async(lambda: self._run_scheduled_highlight(request))
+
+    def _run_scheduled_highlight(self, request):
+        if request != self._highlight_request:
+            # superseded by a later selection change
+            return
+        change_count = self.view.change_count()
+        regions = list(self.get_regex_regions())
+        if change_count != self.view.change_count():
+            # the view was modified in the meantime,
+            # which also results in a new selection change
+            return
+
         prefs = package_settings()
         self.view.add_regions(
             key='captures',
-            regions=list(self.get_regex_regions()),
+            regions=regions,
             scope=prefs['syntax.captures_highlight_scope'],
             flags=region_flags_from_strings(prefs['syntax.captures_highlight_styles']),
         )
@@ -37,7 +62,10 @@ class SyntaxDefRegexCaptureGroupHighlighter(sublime_plugin.ViewEventListener):
             )
             for region in self.view.split_by_newlines(selection)
         ]
+        if not locations:
+            return
 
+        regexp_index = region_index(self.view, 'source.regexp.oniguruma')
         for loc in locations:
             # Find the line number.
             match = re.search(r'(\d+):', self.view.substr(self.view.line(loc)))
@@ -46,49 +74,48 @@ class SyntaxDefRegexCaptureGroupHighlighter(sublime_plugin.ViewEventListener):
             n = int(match.group(1))
 
             # Find the associated regexp. Assume it's the preceding one.
-            try:
-                regexp_region = [
-                    region
-                    for region in self.view.find_by_selector('source.regexp.oniguruma')
-                    if region.end() < loc
-                ][-1]
-            except IndexError:
+            regexp_region = regexp_index.last_ending_before(loc)
+            if regexp_region is None:
                 continue
 
-            if n == 0:
-                yield regexp_region
-                continue
+            region = self._capture_map(regexp_region).get(n)
+            if region is not None:
+                yield region
 
-            # Find parens that define capture groups.
-            regexp_offset = regexp_region.begin()
-            parens = iter(
-                (match.group(), match.start() + regexp_offset)
-                for match in re.finditer(r'\(\??|\)', self.view.substr(regexp_region))
-                if self.view.match_selector(match.start() + regexp_offset, 'keyword.control.group')
-            )
+    def _capture_map(self, regexp_region):
+        """Return the regions of all capture groups of a regexp, indexed by their number."""
+        change_count = self.view.change_count()
+        if change_count != self._capture_maps_change_count:
+            self._capture_maps.clear()
+            self._capture_maps_change_count = change_count
+
+        key = (regexp_region.begin(), regexp_region.end())
+        capture_map = self._capture_maps.get(key)
+        if capture_map is None:
+            capture_map = self._capture_maps[key] = self._build_capture_map(regexp_region)
+        return capture_map
 
-            # Find the start of the nth capture group.
-            start = None
-            count = 0
-            for p, i in parens:
-                if p == '(':  # Not (?
-                    count += 1
-                    if count == n:
-                        start = i
-                        break
-
-            # Find the end of that capture group
-            end = None
-            depth = 0
-            for p, i in parens:
-                if p in {'(', '(?'}:
-                    depth += 1
-                else:
-                    if depth == 0:
-                        end = i + 1
-                        break
-                    else:
-                        depth -= 1
-
-            if end is not None:
-                yield sublime.Region(start, end)
+    def _build_capture_map(self, regexp_region):
+        capture_map = {0: regexp_region}
+        group_index = region_index(self.view, 'keyword.control.group')
+
+        # Match parens that define groups, numbering capturing groups in order.
+        regexp_offset = regexp_region.begin()
+        count = 0
+        # group number or None for non-capturing groups, and start of each open group
+        open_groups = []
+        for match in re.finditer(r'\(\??|\)', self.view.substr(regexp_region)):
+            start = match.start() + regexp_offset
+            if not group_index.at(start):
+                continue
+            if match.group() == ')':
+                if open_groups:
+                    number, begin = open_groups.pop()
+                    if number is not None:
+                        capture_map[number] = sublime.Region(begin, start + 1)
+            elif match.group() == '(':  # Not (?
+                count += 1
+                open_groups.append((count, start))
+            else:
+                open_groups.append((None, start))
+        return capture_map
@@ -0,0 +1,202 @@
+"""Symbols inherited from the syntax definitions a syntax `extends`.
+
+Parent syntaxes are read with `sublime.load_resource`
+and their contexts and variables are extracted
+by a lightweight line-based scan of the top-level mappings
+instead of a full YAML parse.
+Parsed resources are kept in a bounded cache
+keyed by resource path and content hash,
+and the symbols of whole inheritance chains are memoized
+until a syntax definition is saved.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import logging
+import re
+
+import sublime
+
+__all__ = ('ParsedSyntax', 'clear_inherited_symbols', 'inherited_symbols', 'parse_syntax')
+
+logger = logging.getLogger(__name__)
+
+# maximum number of parsed resources to keep
+RESOURCE_CACHE_SIZE = 32
+# maximum number of memoized inheritance chains
+CHAIN_CACHE_SIZE = 16
+# guard against overly deep or cyclic inheritance
+MAX_DEPTH = 16
+
+ParsedSyntax = collections.namedtuple('ParsedSyntax', ['extends', 'symbols'])
+
+_TOP_LEVEL_KEY_RE = re.compile(r"([A-Za-z_][\w-]*)\s*:(?:\s+(.*))?$")
+_KEY_RE = re.compile(r"""(?:'([^']*)'|"([^"]*)"|([^\s:#'"\[\]{},-][^:#]*?))\s*:(?:\s|$)""")
+_SECTIONS = {'contexts': 'context', 'variables': 'variable'}
+
+# {(resource, content hash): ParsedSyntax}
+_resource_cache: collections.OrderedDict[tuple[str, str], ParsedSyntax] = (
+    collections.OrderedDict()
+)
+# {(folder, extends): {kind: [(name, resource)]}}
+_chain_cache: collections.OrderedDict[
+    tuple[str | None, tuple[str, ...]], dict[str, list[tuple[str, str]]]
+] = collections.OrderedDict()
+
+
+def _unquote(value):
+    value = value.split(" #", 1)[0].strip()
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    return value
+
+
+def _parse_extends_value(value):
+    value = value.split(" #", 1)[0].strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [_unquote(item) for item in value[1:-1].split(",") if item.strip()]
+    return [_unquote(value)] if value else []
+
+
+def parse_syntax(text: str) -> ParsedSyntax:
+    """Extract the parents, contexts and variables of a syntax definition.
+
+    Only block-style top-level mappings are supported,
+    which is what syntax definitions use in practice.
+
+    Returns:
+        ParsedSyntax:
+            The `extends` paths as written
+            and the `(name, row)` of the symbols of each kind.
+    """
+    extends = []
+    symbols = {kind: [] for kind in _SECTIONS.values()}
+    section = None
+    indent = None
+
+    for row, line in enumerate(text.splitlines(), 1):
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        if len(stripped) == len(line):
+            # a top-level key
+            section = indent = None
+            match = _TOP_LEVEL_KEY_RE.match(line)
+            if not match:
+                continue
+            key, value = match.groups()
+            if key == 'extends':
+                if value:
+                    extends.extend(_parse_extends_value(value))
+                else:
+                    section = key
+            else:
+                section = _SECTIONS.get(key)
+            continue
+
+        if section is None:
+            continue
+        elif section == 'extends':
+            if stripped.startswith("- "):
+                extends.append(_unquote(stripped[2:]))
+            continue
+
+        line_indent = len(line) - len(stripped)
+        if indent is None:
+            indent = line_indent
+        if line_indent != indent:
+            continue
+        match = _KEY_RE.match(stripped)
+        if match:
+            name = next(group for group in match.groups() if group is not None)
+            symbols[section].append((name, row))
+
+    return ParsedSyntax(extends, symbols)
+
+
+def _resolve(path, folder):
+    """Resolve an `extends` path relative to the folder of the extending syntax."""
+    if path.startswith("Packages/"):
+        return path
+    if folder:
+        return f"{folder}/{path}"
+    return None
+
+
+def _load_parsed(resource):
+    try:
+        content = sublime.load_resource(resource)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.debug("unable to load parent syntax %r - %s", resource, e)
+        return None
+
+    key = (resource, hashlib.sha1(content.encode('utf-8')).hexdigest())
+    parsed = _resource_cache.get(key)
+    if parsed is None:
+        logger.debug("parsing parent syntax %r", resource)
+        parsed = _resource_cache[key] = parse_syntax(content)
+        if len(_resource_cache) > RESOURCE_CACHE_SIZE:
+            _resource_cache.popitem(last=False)
+    else:
+        _resource_cache.move_to_end(key)
+    return parsed
+
+
+def inherited_symbols(extends, folder=None):
+    """Collect the symbols of all syntaxes in the inheritance chain.
+
+    Arguments:
+        extends (list of str):
+            The `extends` paths of the extending syntax.
+        folder (str):
+            The resource folder of the extending syntax
+            to resolve relative paths, if known.
+
+    Returns:
+        {kind: [(name, resource)]}:
+            The symbols of each kind in order of precedence,
+            nearer parents first.
+            Names occur only once per kind.
+    """
+    key = (folder, tuple(extends))
+    result = _chain_cache.get(key)
+    if result is not None:
+        _chain_cache.move_to_end(key)
+        return result
+
+    result = {kind: [] for kind in _SECTIONS.values()}
+    seen_names = {kind: set() for kind in result}
+    seen_resources = set()
+    # breadth-first, so nearer parents take precedence
+    queue = [(_resolve(path, folder), 0) for path in extends]
+    while queue:
+        resource, depth = queue.pop(0)
+        if not resource or resource in seen_resources or depth >= MAX_DEPTH:
+            continue
+        seen_resources.add(resource)
+        parsed = _load_parsed(resource)
+        if not parsed:
+            continue
+        for kind, symbols in parsed.symbols.items():
+            for name, _ in symbols:
+                if name not in seen_names[kind]:
+                    seen_names[kind].add(name)
+                    result[kind].append((name, resource))
+        parent_folder = resource.rpartition("/")[0]
+        queue.extend((_resolve(path, parent_folder), depth + 1) for path in parsed.extends)
+
+    _chain_cache[key] = result
+    if len(_chain_cache) > CHAIN_CACHE_SIZE:
+        _chain_cache.popitem(last=False)
+    return result
+
+
+def clear_inherited_symbols():
+    """Forget the symbols of inheritance chains, e.g. after a parent syntax changed.
+
+    Parsed resources are kept, as they are validated by their content hash.
+    """
+    _chain_cache.clear()
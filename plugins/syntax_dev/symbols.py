@@ -0,0 +1,112 @@
+"""Per-view tables of the symbols defined in a syntax definition.
+
+Contexts, variables and branch points are collected
+together with the line they are defined at.
+A table is built lazily per kind and re-used until the view is modified.
+Contexts and variables inherited through `extends` are resolved by `inheritance`.
+Names and line numbers are taken from a single copy of the view's text
+instead of querying the view for each symbol.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+
+import sublime
+from sublime_lib import ResourcePath
+
+from ..lib.region_index import region_index
+from ..lib.view_cache import ViewCache
+from .inheritance import inherited_symbols
+
+__all__ = ('SYMBOL_SELECTORS', 'SymbolTable', 'clear_symbol_tables', 'symbol_table')
+
+SYMBOL_SELECTORS = {
+    'context': "entity.name.class.context",
+    'variable': "entity.name.constant",
+    'branch_point': "entity.name.label.branch-point",
+}
+EXTENDS_SELECTOR = "meta.extends meta.path"
+
+_cache = ViewCache()
+
+
+class SymbolTable:
+    """The symbols of a view at a specific change count."""
+
+    def __init__(self, view) -> None:
+        self.view = view
+        self._text: str | None = None
+        self._line_starts: list[int] | None = None
+        # {kind: [(name, row)]}
+        self._symbols: dict[str, list[tuple[str, int]]] = {}
+        # {kind: [sublime.CompletionItem]}
+        self._completions: dict[str, list[sublime.CompletionItem]] = {}
+
+    def _row(self, point):
+        """Return the 1-based line number of `point`."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer("\n", self._get_text())]
+        return bisect.bisect_right(self._line_starts, point)
+
+    def _get_text(self):
+        if self._text is None:
+            self._text = self.view.substr(sublime.Region(0, self.view.size()))
+        return self._text
+
+    def symbols(self, kind):
+        """Return the `(name, row)` of all symbols of a kind in order of their definition."""
+        symbols = self._symbols.get(kind)
+        if symbols is None:
+            regions = region_index(self.view, SYMBOL_SELECTORS[kind]).regions
+            text = self._get_text() if regions else ""
+            symbols = self._symbols[kind] = [
+                (text[region.begin() : region.end()], self._row(region.begin()))
+                for region in regions
+            ]
+        return symbols
+
+    def extends(self):
+        """Return the paths of the syntaxes this one extends, as written."""
+        text = self._get_text()
+        return [
+            text[region.begin() : region.end()].strip("'\"")
+            for region in region_index(self.view, EXTENDS_SELECTOR).regions
+        ]
+
+    def inherited_symbols(self, kind):
+        """Return the `(name, resource)` of symbols of a kind inherited from parent syntaxes.
+
+        Symbols defined in the view itself are excluded.
+        """
+        extends = self.extends()
+        if not extends:
+            return []
+        try:
+            folder = str(ResourcePath.from_file_path(self.view.file_name()).parent)
+        except (TypeError, ValueError):
+            folder = None
+        local_names = {name for name, _ in self.symbols(kind)}
+        return [
+            (name, resource)
+            for name, resource in inherited_symbols(extends, folder).get(kind, ())
+            if name not in local_names
+        ]
+
+    def completions(self, kind, build):
+        """Return the completions of a kind, built once by `build(table, kind)`."""
+        completions = self._completions.get(kind)
+        if completions is None:
+            completions = self._completions[kind] = build(self, kind)
+        return completions
+
+
+def symbol_table(view) -> SymbolTable:
+    """Return the symbol table of a view, re-built only after the view has been modified."""
+    return _cache.get(view, None, lambda: SymbolTable(view))
+
+
+def clear_symbol_tables():
+    """Drop the tables of all views, e.g. after a syntax they inherit from changed."""
+    _cache.clear()
@@ -8,8 +8,8 @@ import sublime_plugin
 import yaml
 from sublime_lib import OutputPanel
 
+from .lib import scope_data
 from .lib.fileconv import dumpers, loaders
-from .lib.scope_data import COMPILED_HEADS
 from .lib.view_utils import base_scope, extract_selector, get_viewport_coords, set_viewport
 
 __all__ = (
@@ -408,7 +408,7 @@ class LegacySyntaxDefCompletions(sublime_plugin.EventListener):
                     del tokens[-1]  # The last token is either incomplete or empty
 
                     # Browse the nodes and their children
-                    nodes = COMPILED_HEADS
+                    nodes = scope_data.COMPILED_HEADS
                     node = None
                     for i, token in enumerate(tokens):
                         node = nodes.find(token)
@@ -447,7 +447,7 @@ class LegacySyntaxDefCompletions(sublime_plugin.EventListener):
                         return inhibit([(base_suffix,) * 2])
 
             # Just return all the head nodes
-            return inhibit(COMPILED_HEADS.to_completion())
+            return inhibit(scope_data.COMPILED_HEADS.to_completion())
 
         # Check if triggered by a "."
         if view.substr(loc - 1) == ".":